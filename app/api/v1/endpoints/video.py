@@ -604,18 +604,29 @@ async def stream_video_download(
         logger.info(
             f"Successfully extracted video ID: {video_id} from URL: {url}")
 
-        # Get video bytes from TikTok service
+        # Stream video bytes from TikTok service without buffering the file
         logger.debug(
-            f"Calling TikTok service for video bytes - Video ID: {video_id}")
-        video_bytes = await tiktok_service.get_video_bytes(
+            f"Calling TikTok service for video stream - Video ID: {video_id}")
+        stream = tiktok_service.stream_video_bytes(
             video_id,
             video_url=url,
             watermark=watermark,
             quality=quality.value,
             custom_ms_token=ms_token
         )
-        logger.info(
-            f"Successfully retrieved video bytes for {video_id}: {len(video_bytes)} bytes")
+
+        # Pull the first chunk eagerly so resolution errors still surface
+        # as proper HTTP errors instead of dying mid-stream
+        try:
+            first_chunk = await stream.__anext__()
+        except StopAsyncIteration:
+            first_chunk = b""
+
+        async def video_stream():
+            if first_chunk:
+                yield first_chunk
+            async for chunk in stream:
+                yield chunk
 
         # Create filename for download
         filename = f"tiktok_video_{video_id}.mp4"
@@ -627,17 +638,16 @@ async def stream_video_download(
         # Prepare streaming response headers
         headers = {
             "Content-Disposition": f"attachment; filename={filename}",
-            "Content-Length": str(len(video_bytes)),
             "Cache-Control": "no-cache"
         }
         logger.debug(f"Prepared streaming response headers: {headers}")
 
         logger.info(
-            f"Successfully prepared streaming response for {video_id} - {len(video_bytes)} bytes, filename: {filename}")
+            f"Successfully started streaming response for {video_id}, filename: {filename}")
 
         # Return streaming response with appropriate headers
         return StreamingResponse(
-            iter([video_bytes]),
+            video_stream(),
             media_type="video/mp4",
             headers=headers
         )
@@ -69,6 +69,22 @@ class Settings(BaseSettings):
         default=True,
         description="Run TikTok browser in headless mode"
     )
+    thread_pool_size: int = Field(
+        default=200,
+        description="Capacity of the anyio thread pool used for sync endpoints"
+    )
+    http_max_keepalive_connections: int = Field(
+        default=64,
+        description="Keep-alive connections held by the shared download client"
+    )
+    http_max_connections: int = Field(
+        default=128,
+        description="Total connection cap for the shared download client"
+    )
+    http_keepalive_expiry: int = Field(
+        default=60,
+        description="Seconds an idle keep-alive connection stays open"
+    )
 
     # Webshare Proxy Configuration
     webshare_api_key: Optional[str] = Field(
@@ -3,6 +3,7 @@
 import logging
 from contextlib import asynccontextmanager
 
+import anyio
 from fastapi import FastAPI, Request, status
 from fastapi.openapi.utils import get_openapi
 from fastapi.exceptions import RequestValidationError
@@ -18,6 +19,7 @@ from app.api.v1.router import api_router
 from app.models.schemas import ErrorResponse, HealthResponse
 from app.services.tiktok_service import get_tiktok_service
 from app.services.token_manager import get_token_manager
+from app.utils.url_parser import aclose_resolver_client
 
 # Configure logging
 logging.basicConfig(
@@ -42,9 +44,22 @@ async def lifespan(app: FastAPI):
     logger.info(f"API Keys configured: {len(settings.api_keys_list)}")
     logger.info(f"MS Tokens configured: {len(settings.ms_tokens_list)}")
 
+    # Resize the shared thread pool used for sync endpoints. The anyio
+    # default is 40 tokens, which silently serializes requests under load.
+    limiter_tokens = anyio.to_thread.current_default_thread_limiter()
+    limiter_tokens.total_tokens = settings.thread_pool_size
+    logger.info(f"Thread pool size set to {settings.thread_pool_size}")
+
+    # Prefetch the proxy pool so the first proxied request finds it warm
+    tiktok_service = get_tiktok_service()
+    if tiktok_service.proxy_provider:
+        try:
+            await tiktok_service.proxy_provider.start()
+        except Exception as e:
+            logger.warning(f"Proxy prefetch at startup failed: {e}")
+
     # Health check on startup
     try:
-        tiktok_service = get_tiktok_service()
         health_result = await tiktok_service.health_check()
         logger.info(f"TikTok service health check: {health_result['status']}")
     except Exception as e:
@@ -54,6 +69,11 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down TikTok API Backend...")
+    tiktok_service = get_tiktok_service()
+    await tiktok_service.aclose()
+    if tiktok_service.proxy_provider:
+        await tiktok_service.proxy_provider.aclose()
+    await aclose_resolver_client()
 
 
 # Create FastAPI application
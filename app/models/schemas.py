@@ -1,5 +1,6 @@
 """Pydantic models for API responses."""
 
+import re
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 from pydantic import BaseModel, Field
@@ -299,35 +300,47 @@ class VideoDownloadResponse(BaseModel):
 
 
 # Utility functions for converting TikTok API data to Pydantic models
-def create_tiktok_user(user_data: Dict[str, Any]) -> TikTokUser:
+# Model constructors and helpers are bound as default arguments so each call
+# hits fast locals instead of a LOAD_GLOBAL; this compounds when deserializing
+# long lists on trending/search endpoints.
+_EMPTY: Dict[str, Any] = {}
+
+
+def _normalize_avatar(avatar_data):
+    """Normalize avatar fields - they might be strings or dicts."""
+    if isinstance(avatar_data, str):
+        return {"url": avatar_data}
+    elif isinstance(avatar_data, dict):
+        return avatar_data
+    else:
+        return {}
+
+
+def create_tiktok_user(user_data: Dict[str, Any], _User=TikTokUser, _normalize_avatar=_normalize_avatar, _EMPTY=_EMPTY) -> TikTokUser:
     """Create TikTokUser from API data."""
-    # Handle avatar fields - they might be strings or dicts
-    def normalize_avatar(avatar_data):
-        if isinstance(avatar_data, str):
-            return {"url": avatar_data}
-        elif isinstance(avatar_data, dict):
-            return avatar_data
-        else:
-            return {}
-
-    return TikTokUser(
+    stats = user_data.get("stats") or _EMPTY
+    return _User(
         id=str(user_data.get("id", "")),
         username=user_data.get("uniqueId", ""),
         nickname=user_data.get("nickname", ""),
         signature=user_data.get("signature", ""),
-        avatar_thumb=normalize_avatar(user_data.get("avatarThumb", {})),
-        avatar_medium=normalize_avatar(user_data.get("avatarMedium", {})),
-        avatar_larger=normalize_avatar(user_data.get("avatarLarger", {})),
+        avatar_thumb=_normalize_avatar(user_data.get("avatarThumb", _EMPTY)),
+        avatar_medium=_normalize_avatar(user_data.get("avatarMedium", _EMPTY)),
+        avatar_larger=_normalize_avatar(user_data.get("avatarLarger", _EMPTY)),
         verified=user_data.get("verified", False),
-        follower_count=user_data.get("stats", {}).get("followerCount", 0),
-        following_count=user_data.get("stats", {}).get("followingCount", 0),
-        heart_count=user_data.get("stats", {}).get("heartCount", 0),
-        video_count=user_data.get("stats", {}).get("videoCount", 0),
-        digg_count=user_data.get("stats", {}).get("diggCount", 0),
+        follower_count=stats.get("followerCount", 0),
+        following_count=stats.get("followingCount", 0),
+        heart_count=stats.get("heartCount", 0),
+        video_count=stats.get("videoCount", 0),
+        digg_count=stats.get("diggCount", 0),
     )
 
 
-def create_tiktok_video(video_data: Dict[str, Any], include_download_urls: bool = False) -> TikTokVideo:
+_HASHTAG_PATTERN = re.compile(r'#(\w+)')
+_MENTION_PATTERN = re.compile(r'@(\w+)')
+
+
+def create_tiktok_video(video_data: Dict[str, Any], include_download_urls: bool = False, _Video=TikTokVideo, _EMPTY=_EMPTY) -> TikTokVideo:
     """Create TikTokVideo from API data."""
     # Extract hashtags from description
     desc = video_data.get("desc", "")
@@ -335,16 +348,15 @@ def create_tiktok_video(video_data: Dict[str, Any], include_download_urls: bool
     mentions = []
 
     if desc:
-        import re
-        hashtags = re.findall(r'#(\w+)', desc)
-        mentions = re.findall(r'@(\w+)', desc)
+        hashtags = _HASHTAG_PATTERN.findall(desc)
+        mentions = _MENTION_PATTERN.findall(desc)
 
     # Extract download URLs if requested
     download_urls = None
     if include_download_urls:
         download_urls = extract_download_urls_from_video_data(video_data)
 
-    return TikTokVideo(
+    return _Video(
         id=str(video_data.get("id", "")),
         desc=desc,
         create_time=video_data.get("createTime", 0),
@@ -359,27 +371,28 @@ def create_tiktok_video(video_data: Dict[str, Any], include_download_urls: bool
     )
 
 
-def create_tiktok_hashtag(hashtag_data: Dict[str, Any]) -> TikTokHashtag:
+def create_tiktok_hashtag(hashtag_data: Dict[str, Any], _Hashtag=TikTokHashtag, _EMPTY=_EMPTY) -> TikTokHashtag:
     """Create TikTokHashtag from API data."""
-    return TikTokHashtag(
+    stats = hashtag_data.get("stats") or _EMPTY
+    return _Hashtag(
         id=str(hashtag_data.get("id", "")),
         name=hashtag_data.get("name", ""),
         title=hashtag_data.get("title", ""),
         desc=hashtag_data.get("desc", ""),
-        video_count=hashtag_data.get("stats", {}).get("videoCount", 0),
-        view_count=hashtag_data.get("stats", {}).get("viewCount", 0),
+        video_count=stats.get("videoCount", 0),
+        view_count=stats.get("viewCount", 0),
     )
 
 
-def create_tiktok_sound(sound_data: Dict[str, Any]) -> TikTokSound:
+def create_tiktok_sound(sound_data: Dict[str, Any], _Sound=TikTokSound, _EMPTY=_EMPTY) -> TikTokSound:
     """Create TikTokSound from API data."""
-    return TikTokSound(
+    return _Sound(
         id=str(sound_data.get("id", "")),
         title=sound_data.get("title", ""),
         play_url=sound_data.get("playUrl", ""),
-        cover_thumb=sound_data.get("coverThumb", {}),
-        cover_medium=sound_data.get("coverMedium", {}),
-        cover_large=sound_data.get("coverLarge", {}),
+        cover_thumb=sound_data.get("coverThumb", _EMPTY),
+        cover_medium=sound_data.get("coverMedium", _EMPTY),
+        cover_large=sound_data.get("coverLarge", _EMPTY),
         author_name=sound_data.get("authorName", ""),
         original=sound_data.get("original", False),
         duration=sound_data.get("duration", 0),
@@ -387,9 +400,9 @@ def create_tiktok_sound(sound_data: Dict[str, Any]) -> TikTokSound:
     )
 
 
-def create_tiktok_comment(comment_data: Dict[str, Any]) -> TikTokComment:
+def create_tiktok_comment(comment_data: Dict[str, Any], _Comment=TikTokComment) -> TikTokComment:
     """Create TikTokComment from API data."""
-    return TikTokComment(
+    return _Comment(
         id=str(comment_data.get("cid", "")),
         text=comment_data.get("text", ""),
         create_time=comment_data.get("createTime", 0),
@@ -2,7 +2,7 @@
 
 import random
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Optional, Sequence
 from app.services.proxy.models import Proxy
 
 
@@ -10,7 +10,7 @@ class Algorithm(ABC):
     """Base algorithm class for proxy selection."""
 
     @abstractmethod
-    def select(self, proxies: List[Proxy]) -> Optional[Proxy]:
+    def select(self, proxies: Sequence[Proxy]) -> Optional[Proxy]:
         """Select a proxy from the list."""
         pass
 
@@ -21,7 +21,7 @@ class RoundRobin(Algorithm):
     def __init__(self):
         self.current_index = 0
 
-    def select(self, proxies: List[Proxy]) -> Optional[Proxy]:
+    def select(self, proxies: Sequence[Proxy]) -> Optional[Proxy]:
         """Select next proxy in rotation."""
         if not proxies:
             return None
@@ -34,7 +34,7 @@ class RoundRobin(Algorithm):
 class Random(Algorithm):
     """Random proxy selection algorithm."""
 
-    def select(self, proxies: List[Proxy]) -> Optional[Proxy]:
+    def select(self, proxies: Sequence[Proxy]) -> Optional[Proxy]:
         """Select random proxy from list."""
         if not proxies:
             return None
@@ -44,7 +44,7 @@ class Random(Algorithm):
 class First(Algorithm):
     """Always select first proxy."""
 
-    def select(self, proxies: List[Proxy]) -> Optional[Proxy]:
+    def select(self, proxies: Sequence[Proxy]) -> Optional[Proxy]:
         """Select first proxy."""
         if not proxies:
             return None
@@ -1,43 +1,127 @@
 """Base proxy provider interface."""
 
+import itertools
+import random
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from array import array
+from typing import Dict, Optional, Tuple
 from app.services.proxy.models import Proxy, ProxyObject
 from app.services.proxy.algorithms import Algorithm, RoundRobin
 
+# Weight bounds for failure-aware round-robin selection
+_FULL_WEIGHT = 100
+_MIN_WEIGHT = 1
+_FAILURE_PENALTY = 25
+
 
 class ProxyProvider(ABC):
     """Abstract base class for proxy providers."""
 
     def __init__(self, algorithm: Optional[Algorithm] = None):
         self.algorithm = algorithm or RoundRobin()
-        self._proxies: List[Proxy] = []
+        # Immutable snapshot, replaced wholesale on refresh. Reference
+        # assignment is atomic under the GIL, so readers see either the old
+        # or the new tuple without any locking.
+        self._proxies: Tuple[Proxy, ...] = ()
+        # Parallel int array of selection weights (SoA layout): failing
+        # proxies are downweighted, not removed, so they recover on success.
+        self._weights = array("i")
+        self._index: Dict[Proxy, int] = {}
+        self._pw_dicts: Tuple[dict, ...] = ()
+        # Atomic round-robin cursor: next() on itertools.count is a single
+        # C-level increment, so the hot path needs no lock or CAS retries.
+        self._cursor = itertools.count()
 
     @abstractmethod
-    async def fetch_proxies(self) -> List[Proxy]:
+    async def fetch_proxies(self) -> Tuple[Proxy, ...]:
         """Fetch proxies from the provider."""
         pass
 
-    def list_proxies(self) -> List[Proxy]:
-        """Get list of available proxies."""
+    def _install_proxies(self, proxies: Tuple[Proxy, ...]) -> None:
+        """Publish a fresh proxy snapshot with reset weights."""
+        self._weights = array("i", [_FULL_WEIGHT] * len(proxies))
+        self._index = {proxy: i for i, proxy in enumerate(proxies)}
+        # Parallel tuple of ready-made Playwright dicts, indexed the same
+        # as _proxies, so get_proxy_dict is one index away from its result
+        self._pw_dicts = tuple(p.to_playwright_format() for p in proxies)
+        self._proxies = proxies
+
+    def mark_proxy_failure(self, proxy: Proxy) -> None:
+        """Downweight a proxy after a failed request."""
+        idx = self._index.get(proxy)
+        if idx is not None and idx < len(self._weights):
+            self._weights[idx] = max(
+                _MIN_WEIGHT, self._weights[idx] - _FAILURE_PENALTY)
+
+    def mark_proxy_success(self, proxy: Proxy) -> None:
+        """Restore a proxy to full weight after a successful request."""
+        idx = self._index.get(proxy)
+        if idx is not None and idx < len(self._weights):
+            self._weights[idx] = _FULL_WEIGHT
+
+    def list_proxies(self) -> Tuple[Proxy, ...]:
+        """Get the current snapshot of available proxies."""
         return self._proxies
 
-    def get_proxy(self, *args, **kwargs) -> Optional[ProxyObject]:
-        """Get next proxy as ProxyObject with format() method."""
-        if not self._proxies:
+    def select_proxies(self, count: int) -> Tuple[Proxy, ...]:
+        """Select up to `count` proxies through the weighted path.
+
+        Callers keep the returned Proxy objects so request outcomes can
+        be routed back through mark_proxy_success/mark_proxy_failure.
+        """
+        selected = []
+        for _ in range(count):
+            proxy = self._select()
+            if proxy is None:
+                break
+            selected.append(proxy)
+        return tuple(selected)
+
+    def _select_index(self) -> int:
+        """Pick the index of the next proxy, or -1 when the pool is empty."""
+        # Snapshot into locals so a concurrent refresh can't tear the view
+        proxies = self._proxies
+        if not proxies:
+            return -1
+
+        if type(self.algorithm) is RoundRobin:
+            weights = self._weights
+            n = len(proxies)
+            idx = next(self._cursor) % n
+            # Probabilistically skip downweighted proxies so a partially
+            # failing pool doesn't tilt traffic into dead hosts. Bounded to
+            # one sweep; the last candidate is used unconditionally.
+            for _ in range(n):
+                weight = weights[idx] if idx < len(weights) else _FULL_WEIGHT
+                if weight >= _FULL_WEIGHT or random.random() * _FULL_WEIGHT < weight:
+                    break
+                idx = next(self._cursor) % n
+            return idx
+        proxy = self.algorithm.select(proxies)
+        if proxy is None:
+            return -1
+        return self._index.get(proxy, -1)
+
+    def _select(self) -> Optional[Proxy]:
+        """Select the next proxy, fast-pathing round-robin selection."""
+        idx = self._select_index()
+        if idx < 0:
             return None
+        return self._proxies[idx]
 
-        proxy = self.algorithm.select(self._proxies)
+    def get_proxy(self, *args, **kwargs) -> Optional[ProxyObject]:
+        """Get next proxy as ProxyObject with format() method."""
+        proxy = self._select()
         if proxy:
             return ProxyObject(proxy)
         return None
 
     def get_proxy_dict(self) -> Optional[dict]:
         """Get next proxy in Playwright format."""
-        if not self._proxies:
-            return None
-
-        proxy = self.algorithm.select(self._proxies)
-        if proxy:
-            return proxy.to_playwright_format()
+        # Structure-of-arrays hot path: index straight into the precomputed
+        # dict tuple without touching the Proxy object at all
+        idx = self._select_index()
+        pw_dicts = self._pw_dicts
+        if 0 <= idx < len(pw_dicts):
+            return pw_dicts[idx]
         return None
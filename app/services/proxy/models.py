@@ -4,32 +4,48 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(frozen=True)
 class Proxy:
-    """Proxy data model."""
+    """Proxy data model.
+
+    Instances are immutable after fetch, so the Playwright dict and string
+    forms are computed once up front instead of on every request.
+    """
 
     host: str
     port: int
     username: Optional[str] = None
     password: Optional[str] = None
-    country_code: Optional[str] = None
 
-    def to_playwright_format(self) -> dict:
-        """Convert proxy to Playwright format for TikTok-Api."""
-        proxy_dict = {
-            "server": f"http://{self.host}:{self.port}"
-        }
+    def __post_init__(self):
+        # Evaluate the credential check once; every consumer reads the flag
+        has_auth = bool(self.username and self.password)
+        server = f"http://{self.host}:{self.port}"
+        if has_auth:
+            proxy_dict = {
+                "server": server,
+                "username": self.username,
+                "password": self.password,
+            }
+            proxy_str = f"http://{self.username}:{self.password}@{self.host}:{self.port}"
+        else:
+            proxy_dict = {"server": server}
+            proxy_str = server
+        object.__setattr__(self, "_has_auth", has_auth)
+        object.__setattr__(self, "_playwright_dict", proxy_dict)
+        object.__setattr__(self, "_str", proxy_str)
 
-        if self.username and self.password:
-            proxy_dict["username"] = self.username
-            proxy_dict["password"] = self.password
+    @property
+    def has_auth(self) -> bool:
+        """Whether this proxy carries username/password credentials."""
+        return self._has_auth
 
-        return proxy_dict
+    def to_playwright_format(self) -> dict:
+        """Convert proxy to Playwright format for TikTok-Api."""
+        return self._playwright_dict
 
     def __str__(self) -> str:
-        if self.username and self.password:
-            return f"http://{self.username}:{self.password}@{self.host}:{self.port}"
-        return f"http://{self.host}:{self.port}"
+        return self._str
 
 
 class ProxyFormat:
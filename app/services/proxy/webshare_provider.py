@@ -1,75 +1,179 @@
 """Webshare proxy provider implementation."""
 
+import asyncio
 import logging
-from typing import List, Optional
+import math
+import time
+from typing import List, Optional, Tuple
 import httpx
 
 from app.services.proxy.base_provider import ProxyProvider
 from app.services.proxy.models import Proxy
 from app.services.proxy.algorithms import Algorithm
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Query parameters match the working curl; only the page number varies
+_PAGE_SIZE = 100
+_BASE_PARAMS = {
+    "mode": "direct",
+    "page_size": _PAGE_SIZE
+}
+
 
 class Webshare(ProxyProvider):
     """Webshare proxy provider."""
 
     WEBSHARE_API_URL = "https://proxy.webshare.io/api/v2/proxy/list/"
+    PAGE_SIZE = _PAGE_SIZE
+    MAX_CONCURRENT_PAGES = 8
+    REFRESH_TTL = 900.0  # seconds before a background refresh is scheduled
 
     def __init__(self, api_key: str, algorithm: Optional[Algorithm] = None, cookie: Optional[str] = None):
         super().__init__(algorithm)
         self.api_key = api_key
         self.cookie = cookie or "_tid=53ee2bfc-4e7f-4752-a718-e72fd5db7e3c"
         self._initialized = False
+        self._client: Optional[httpx.AsyncClient] = None
+        self._fetched_at: float = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_loop_task: Optional[asyncio.Task] = None
 
-    async def fetch_proxies(self) -> List[Proxy]:
-        """Fetch proxies from Webshare API."""
-        try:
-            headers = {
-                "Authorization": f"Token {self.api_key}",
-                "Cookie": self.cookie
-            }
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the persistent HTTP client, creating it on first use.
 
-            # Add query parameters like in the working curl
-            params = {
-                "mode": "direct",
-                "page": 1,
-                "page_size": 100
+        Reusing one client keeps connections pooled so proxy list refreshes
+        skip DNS/TCP/TLS handshakes after the first call.
+        """
+        if self._client is None or self._client.is_closed:
+            client_kwargs = {
+                "timeout": 30.0,
+                "limits": httpx.Limits(
+                    max_keepalive_connections=4, max_connections=8),
+                "headers": {
+                    "Authorization": f"Token {self.api_key}",
+                    "Cookie": self.cookie
+                }
             }
+            try:
+                # HTTP/2 multiplexes concurrent page fetches over one
+                # connection; requires the optional h2 package
+                self._client = httpx.AsyncClient(http2=True, **client_kwargs)
+            except ImportError:
+                self._client = httpx.AsyncClient(**client_kwargs)
+        return self._client
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(self.WEBSHARE_API_URL, headers=headers, params=params)
-                response.raise_for_status()
+    async def start(self) -> None:
+        """Warm the proxy pool and keep it fresh in the background.
 
+        Called at application startup so the first request never pays the
+        cold-fetch round-trip; a periodic task then re-fetches every
+        REFRESH_TTL seconds.
+        """
+        await self.fetch_proxies()
+        if self._refresh_loop_task is None or self._refresh_loop_task.done():
+            self._refresh_loop_task = asyncio.create_task(
+                self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        """Periodically refresh the proxy list."""
+        while True:
+            await asyncio.sleep(self.REFRESH_TTL)
+            try:
+                await self.fetch_proxies()
+            except Exception as e:
+                logger.error(f"Periodic proxy refresh failed: {e}")
+
+    async def aclose(self) -> None:
+        """Stop the refresh loop and close the persistent HTTP client."""
+        if self._refresh_loop_task is not None:
+            self._refresh_loop_task.cancel()
+            self._refresh_loop_task = None
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+
+    async def _fetch_page(self, client: httpx.AsyncClient, page: int,
+                          semaphore: asyncio.Semaphore) -> Tuple[List[dict], int]:
+        """Fetch a single page of the proxy list, returning (results, count)."""
+        params = {**_BASE_PARAMS, "page": page}
+        async with semaphore:
+            response = await client.get(self.WEBSHARE_API_URL, params=params)
+            response.raise_for_status()
+            # orjson decodes the raw bytes several times faster than the
+            # stdlib parser; fall back to response.json() when unavailable
+            if orjson is not None:
+                data = orjson.loads(response.content)
+            else:
                 data = response.json()
-                proxies = []
-
-                for result in data.get("results", []):
-                    proxy = Proxy(
-                        host=result["proxy_address"],
-                        port=result["port"],
-                        username=result.get("username"),
-                        password=result.get("password"),
-                        country_code=result.get("country_code")
-                    )
-                    proxies.append(proxy)
-
-                self._proxies = proxies
-                self._initialized = True
-                logger.info(f"Fetched {len(proxies)} proxies from Webshare")
-                return proxies
+        return data.get("results", []), data.get("count", 0)
+
+    async def fetch_proxies(self) -> Tuple[Proxy, ...]:
+        """Fetch the full proxy list from the Webshare API.
+
+        Page 1 is fetched first to learn the total count, then the remaining
+        pages are fetched concurrently so a K-page refresh costs ~1 RTT
+        instead of K. The result is published as an immutable tuple swapped
+        in with a single assignment, so concurrent readers never see a torn
+        list.
+        """
+        try:
+            client = self._get_client()
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PAGES)
+
+            results, total = await self._fetch_page(client, 1, semaphore)
+            n_pages = math.ceil(total / self.PAGE_SIZE) if total else 1
+            if n_pages > 1:
+                rest = await asyncio.gather(*[
+                    self._fetch_page(client, page, semaphore)
+                    for page in range(2, n_pages + 1)
+                ])
+                for page_results, _ in rest:
+                    results.extend(page_results)
+
+            proxies = tuple(
+                Proxy(
+                    host=result["proxy_address"],
+                    port=result["port"],
+                    username=result.get("username"),
+                    password=result.get("password")
+                )
+                for result in results
+            )
+
+            self._install_proxies(proxies)
+            self._initialized = True
+            self._fetched_at = time.monotonic()
+            logger.info(f"Fetched {len(proxies)} proxies from Webshare")
+            return proxies
 
         except httpx.HTTPError as e:
             logger.error(f"Failed to fetch proxies from Webshare: {e}")
             logger.error(
                 f"API Key: {self.api_key[:10]}...{self.api_key[-10:] if len(self.api_key) > 20 else self.api_key}")
             logger.error(f"Cookie: {self.cookie}")
-            return []
+            return ()
         except Exception as e:
             logger.error(f"Unexpected error fetching proxies: {e}")
-            return []
+            return ()
 
     async def ensure_initialized(self):
-        """Ensure proxies are fetched before use."""
+        """Ensure proxies are fetched before use.
+
+        Cold start blocks on the first fetch; afterwards callers always get
+        the cached list immediately. Once the TTL expires, a single
+        background task refreshes the list while stale entries keep serving
+        (stale-while-revalidate), so the request path never waits on the
+        Webshare round-trip again.
+        """
         if not self._initialized:
             await self.fetch_proxies()
+            return
+
+        if (time.monotonic() - self._fetched_at > self.REFRESH_TTL and
+                (self._refresh_task is None or self._refresh_task.done())):
+            self._refresh_task = asyncio.create_task(self.fetch_proxies())
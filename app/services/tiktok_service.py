@@ -4,9 +4,14 @@ import os
 from app.config import get_settings
 from app.services.token_manager import get_token_manager
 import asyncio
+import functools
 import logging
+import operator
+import random
+import threading
 import time
 from typing import List, Dict, Any, Optional, AsyncGenerator
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 import httpx
 
@@ -21,31 +26,121 @@ try:
     # from proxyproviders import Webshare, BrightData
     # from proxyproviders.algorithms import RoundRobin, Random, First, Algorithm
     PROXY_PROVIDERS_AVAILABLE = True
+    # Built once at import time; _get_proxy_algorithm instantiates from it
+    # instead of constructing all three algorithms per lookup
+    _ALGO_FACTORIES = {
+        "round-robin": RoundRobin,
+        "random": Random,
+        "first": First,
+    }
 except ImportError:
     PROXY_PROVIDERS_AVAILABLE = False
+    _ALGO_FACTORIES = {}
 
 # Create our own TikTokException to avoid constructor issues
 
 
 class TikTokException(Exception):
-    """Custom TikTok API exception."""
+    """Custom TikTok API exception.
+
+    Raised with ``raise ... from e`` so the original error travels as
+    ``__cause__`` and is only formatted into the message when someone
+    actually stringifies the exception.
+    """
+
+    __slots__ = ("message",)
 
     def __init__(self, message: str):
         self.message = message
         super().__init__(self.message)
 
+    def __str__(self) -> str:
+        cause = self.__cause__
+        if cause is not None:
+            return f"{self.message}: {cause}"
+        return self.message
+
 
 logger = logging.getLogger(__name__)
 
 
+def _identity(item):
+    return item
+
+
+_as_dict = operator.attrgetter("as_dict")
+
+
+def _as_dict_batch(items):
+    """Materialize a batch of API objects into dicts (runs in a thread)."""
+    return [item.as_dict for item in items]
+
+# Substrings identifying HD/SD variants in bitrateInfo GearName fields
+_HD_TOKENS = ("hd", "high")
+_SD_TOKENS = ("sd", "standard")
+
+# End-of-stream sentinel for the _collect prefetch queue (None is a
+# conceivable item value, a private object is not)
+_COLLECT_DONE = object()
+
+# Fallback URL template for video lookups when no URL was supplied
+_GENERIC_VIDEO_URL = "https://www.tiktok.com/@user/video/{}"
+_URL_ERROR_MARKER = "url"
+
+
+def _with_api(error_fmt: str):
+    """Wrap a service method with API checkout and error normalization.
+
+    The wrapped coroutine receives the checked-out ``api`` as its first
+    argument after ``self``; the decorator owns the ``get_api_instance``
+    context and the standard log-and-reraise handling that every public
+    method used to repeat. ``error_fmt`` is formatted with the call's
+    positional arguments to build the failure message, e.g.
+    ``"fetch user videos for {0}"``.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args, custom_ms_token: Optional[str] = None, **kwargs):
+            try:
+                async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
+                    return await fn(self, api, *args, **kwargs)
+            except Exception as e:
+                label = error_fmt.format(*args)
+                logger.error("Failed to %s: %s", label, e)
+                raise TikTokException(f"Failed to {label}") from e
+        return wrapper
+    return decorator
+
+
 class TikTokService:
     """Service layer for TikTok API operations."""
 
     def __init__(self):
         self.settings = get_settings()
         self.token_manager = get_token_manager()
-        self._api_instance: Optional[TikTokApi] = None
+        # Settings are immutable at runtime; freeze the session parameters
+        # into plain attributes so session creation skips the chained
+        # settings lookups
+        self._num_sessions = self.settings.tiktok_num_sessions
+        self._sleep_after = self.settings.tiktok_sleep_after
+        self._browser = self.settings.tiktok_browser
+        self._api: Optional[TikTokApi] = None
+        self._api_pool: Optional[asyncio.Queue] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
         self._lock = asyncio.Lock()
+        # Single-flight pool bootstrap: only one coroutine builds the pool
+        # (and pays the browser launch); the rest wait on the event.
+        self._pool_init_lock = asyncio.Lock()
+        self._pool_ready = asyncio.Event()
+        self._last_ok_at: float = 0.0
+        # TTL cache of video metadata keyed by (video_id, video_url), with
+        # per-key locks so concurrent requests for the same video coalesce
+        # into one Playwright round-trip (single-flight)
+        self._video_info_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._video_info_locks: Dict[tuple, asyncio.Lock] = {}
+        # Proxies bound to each live API instance, keyed by id(api), so
+        # request outcomes feed the provider's selection weights
+        self._api_proxies: Dict[int, tuple] = {}
 
         # Initialize proxy provider if enabled
         self.proxy_provider = None
@@ -74,324 +169,519 @@ class TikTokService:
         if not PROXY_PROVIDERS_AVAILABLE:
             return None
 
-        algorithm_map = {
-            "round-robin": RoundRobin(),
-            "random": Random(),
-            "first": First(),
+        factory = _ALGO_FACTORIES.get(
+            self.settings.proxy_algorithm, RoundRobin)
+        return factory()
+
+    async def _select_session_proxies(self, count: int) -> tuple:
+        """Pick one weighted proxy per session from the provider.
+
+        Selection goes through the provider's weighted path, so sessions
+        avoid downweighted proxies, and the Proxy objects are kept so
+        request outcomes can be routed back to their weights.
+        """
+        if not self.proxy_provider:
+            logger.info(
+                "No proxy provider or no proxies available, running without proxy")
+            return ()
+
+        await self.proxy_provider.ensure_initialized()
+        selected = self.proxy_provider.select_proxies(count)
+        if selected:
+            logger.info("Using %d proxies", len(selected))
+        else:
+            logger.info(
+                "No proxy provider or no proxies available, running without proxy")
+        return selected
+
+    def _mark_api_proxies(self, api: TikTokApi, ok: bool) -> None:
+        """Route a request outcome to the proxies bound to an instance.
+
+        Attribution is per instance: each session was bound to one
+        weighted proxy at creation, but the failing session is not
+        identifiable from here, so all of the instance's proxies share
+        the signal. The penalty is small and one success restores full
+        weight, so the weights converge on reality either way.
+        """
+        if self.proxy_provider is None:
+            return
+        proxies = self._api_proxies.get(id(api))
+        if not proxies:
+            return
+        mark = (self.proxy_provider.mark_proxy_success if ok
+                else self.proxy_provider.mark_proxy_failure)
+        for proxy in proxies:
+            mark(proxy)
+
+    async def _create_api(self, tokens: List[str], num_sessions: int = 1) -> TikTokApi:
+        """Create a TikTokApi instance with sessions for the given tokens."""
+        api = TikTokApi()
+
+        context_options = {
+            'viewport': {'width': 1280, 'height': 1024},
+            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/88.0.4324.150 Safari/537.36'
         }
-        return algorithm_map.get(self.settings.proxy_algorithm, RoundRobin())
 
-    @asynccontextmanager
-    async def get_api_instance(self, custom_ms_token: Optional[str] = None):
-        """Get TikTok API instance with token rotation."""
-        token = None
-        api = None
+        session_proxies = await self._select_session_proxies(num_sessions)
+        structured_proxies = [
+            proxy.to_playwright_format() for proxy in session_proxies]
+        logger.debug(
+            "==================> Structured proxies: %s", structured_proxies)
+        await api.create_sessions(
+            ms_tokens=tokens,
+            num_sessions=num_sessions,
+            sleep_after=self._sleep_after,
+            browser=self._browser,
+            proxies=structured_proxies,
+            context_options=context_options,
+            headless=True
+        )
+        if session_proxies:
+            self._api_proxies[id(api)] = session_proxies
+        return api
+
+    async def _get_http(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client for CDN downloads, creating it lazily.
+
+        One pooled client keeps keep-alive connections to TikTok CDN hosts
+        warm across downloads instead of paying a TCP+TLS handshake per
+        video.
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            async with self._lock:
+                if self._http_client is None or self._http_client.is_closed:
+                    client_kwargs = {
+                        "timeout": httpx.Timeout(
+                            connect=5.0, read=30.0, write=10.0, pool=5.0),
+                        "limits": httpx.Limits(
+                            max_keepalive_connections=self.settings.http_max_keepalive_connections,
+                            max_connections=self.settings.http_max_connections,
+                            keepalive_expiry=self.settings.http_keepalive_expiry
+                        )
+                    }
+                    try:
+                        self._http_client = httpx.AsyncClient(
+                            http2=True, **client_kwargs)
+                    except ImportError:
+                        self._http_client = httpx.AsyncClient(**client_kwargs)
+        return self._http_client
+
+    @staticmethod
+    async def _close_api(api: TikTokApi) -> None:
+        """Close sessions and stop Playwright for an API instance."""
         try:
-            # Use custom token if provided, otherwise get a healthy token from manager
-            logger.info(
-                f"==================> Getting API instance with custom MS token: {custom_ms_token}")
-            if custom_ms_token:
-                token = custom_ms_token
-                logger.debug(f"Using custom MS token: {token[:10]}...")
-            else:
+            await api.close_sessions()
+            await api.stop_playwright()
+        except Exception as e:
+            logger.warning(f"Error closing TikTok API instance: {e}")
+
+    async def _ensure_pool(self) -> None:
+        """Lazily create the shared API instance with pre-warmed sessions.
+
+        A single TikTokApi launches one Playwright browser hosting
+        tiktok_num_sessions sessions; the queue holds one checkout permit
+        per session, each paired with the token it was created under.
+        """
+        if self._pool_ready.is_set():
+            return
+        async with self._pool_init_lock:
+            if self._pool_ready.is_set():
+                return
+            tokens = []
+            for _ in range(self._num_sessions):
                 token = await self.token_manager.get_token()
                 if not token:
                     raise TikTokException("No healthy MS tokens available")
+                tokens.append(token)
+            api = await self._create_api(
+                list(dict.fromkeys(tokens)), num_sessions=self._num_sessions)
+            pool: asyncio.Queue = asyncio.Queue()
+            for token in tokens:
+                pool.put_nowait((api, token))
+            self._api = api
+            self._api_pool = pool
+            self._pool_ready.set()
+            logger.info(
+                "Initialized TikTok API pool with %d sessions", pool.qsize())
 
-            # Create API instance
-            api = TikTokApi()
-
-            # Ensure proxies are fetched before creating sessions
-            if self.proxy_provider:
-                await self.proxy_provider.ensure_initialized()
-                if self.proxy_provider.list_proxies():
-                    logger.info(
-                        f"Using {len(self.proxy_provider.list_proxies())} proxies")
-
-            # Create sessions with proxy provider (only if proxies are available)
-            proxy_provider = None
-            if self.proxy_provider and self.proxy_provider.list_proxies():
-                proxy_provider = self.proxy_provider
-                logger.info(
-                    f"Using proxy provider with {len(self.proxy_provider.list_proxies())} proxies")
-            else:
-                logger.info(
-                    "No proxy provider or no proxies available, running without proxy")
-
-            context_options = {
-                'viewport': {'width': 1280, 'height': 1024},
-                'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/88.0.4324.150 Safari/537.36'
-            }
-
-            proxies = await proxy_provider.fetch_proxies()
-            structured_proxies = []
-            for proxy in proxies:
-                proxy_object = {
-                    "server": f"http://{proxy.host}:{proxy.port}",
-                    "username": proxy.username,
-                    "password": proxy.password,
-                }
-                structured_proxies.append(proxy_object)
-
-            logger.debug(
-                f"==================> Structured proxies: {structured_proxies}")
-            await api.create_sessions(
-                ms_tokens=[token],
-                num_sessions=self.settings.tiktok_num_sessions,
-                sleep_after=self.settings.tiktok_sleep_after,
-                browser=self.settings.tiktok_browser,
-                # proxy_provider=proxy_provider,
-                proxies=structured_proxies,
-                context_options=context_options,
-                headless=True
-            )
+    @asynccontextmanager
+    async def get_api_instance(self, custom_ms_token: Optional[str] = None):
+        """Get TikTok API instance with token rotation.
 
+        Pooled sessions are created once and reused across requests so the
+        Playwright browser launch is amortized instead of paid per call.
+        Custom MS tokens bypass the pool and get a dedicated instance.
+        """
+        logger.info(
+            "==================> Getting API instance with custom MS token: %s",
+            custom_ms_token)
+        if custom_ms_token:
+            # Dedicated short-lived instance bound to the caller's token
+            logger.debug("Using custom MS token: %.10s...", custom_ms_token)
+            api = None
+            try:
+                api = await self._create_api([custom_ms_token])
+                yield api
+                self._mark_api_proxies(api, ok=True)
+            except Exception as e:
+                if api:
+                    self._mark_api_proxies(api, ok=False)
+                logger.error(f"Error in API instance: {e}")
+                raise
+            finally:
+                if api:
+                    self._api_proxies.pop(id(api), None)
+                    await self._close_api(api)
+            return
+
+        await self._ensure_pool()
+        api, token = await self._api_pool.get()
+        failed = False
+        try:
             yield api
-
-            # Mark token as successful (only for managed tokens, not custom ones)
-            if not custom_ms_token:
-                await self.token_manager.mark_token_success(token)
-
+            await self.token_manager.mark_token_success(token)
+            self._mark_api_proxies(api, ok=True)
+            self._last_ok_at = time.monotonic()
         except Exception as e:
-            # Mark token as failed (only for managed tokens, not custom ones)
-            if token and not custom_ms_token:
-                await self.token_manager.mark_token_failure(token, str(e))
+            failed = True
+            await self.token_manager.mark_token_failure(token, str(e))
+            self._mark_api_proxies(api, ok=False)
             logger.error(f"Error in API instance: {e}")
             raise
         finally:
-            if api:
-                try:
-                    await api.close_sessions()
-                    await api.stop_playwright()
-                except Exception as e:
-                    logger.warning(f"Error closing TikTok API instance: {e}")
+            # The slot goes back no matter how the body exits — including
+            # CancelledError from a client disconnect, which bypasses both
+            # branches above. A lost slot shrinks the pool permanently and
+            # eventually every request hangs on an empty queue.
+            if failed:
+                # Rotate the binding to a fresh healthy token; if none is
+                # available, requeue under the old token rather than drop
+                # the slot (token_manager.get_token has no await points,
+                # so this cannot be interrupted mid-requeue).
+                fresh = await self.token_manager.get_token()
+                if not fresh:
+                    logger.warning(
+                        "No healthy MS tokens available; requeueing pool "
+                        "slot under its previous token")
+                self._api_pool.put_nowait((api, fresh or token))
+            else:
+                self._api_pool.put_nowait((api, token))
+
+    async def aclose(self) -> None:
+        """Close pooled resources (called at application shutdown)."""
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        if self._api_pool is None:
+            return
+        self._pool_ready.clear()
+        while not self._api_pool.empty():
+            self._api_pool.get_nowait()
+        if self._api is not None:
+            self._api_proxies.pop(id(self._api), None)
+            await self._close_api(self._api)
+            self._api = None
+        self._api_pool = None
+
+    _COLLECT_PREFETCH = 32
+    # as_dict batches at least this large are materialized off the event
+    # loop; smaller tails are unwrapped inline to skip thread overhead
+    _COLLECT_OFFLOAD_BATCH = 32
+
+    async def _collect(self, aiter, label: str) -> List[Dict[str, Any]]:
+        """Collect an async iterator of API objects into a list of dicts.
+
+        A producer task drains the iterator into a bounded queue while the
+        consumer unwraps items, so the next network fetch overlaps the
+        Python-side materialization. `as_dict` walks a nested object graph
+        — CPU-bound work — so full batches of it run in a worker thread
+        via asyncio.to_thread, keeping the event loop responsive for other
+        requests. A stream is homogeneous, so the dict-vs-as_dict dispatch
+        is resolved once on the first item and reused for the rest.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._COLLECT_PREFETCH)
+
+        async def produce():
+            try:
+                async for item in aiter:
+                    await queue.put(item)
+            except asyncio.CancelledError:
+                # Only the consumer cancels this task, and only while it
+                # is exiting — nothing is left to read a sentinel
+                raise
+            except Exception as e:
+                # Hand the error to the consumer so it unblocks and
+                # re-raises instead of waiting on the queue forever
+                await queue.put(e)
+                return
+            await queue.put(_COLLECT_DONE)
+
+        producer = asyncio.create_task(produce())
+        out: List[Dict[str, Any]] = []
+        append = out.append
+        unwrap = None
+        pending: List[Any] = []
+        try:
+            while True:
+                item = await queue.get()
+                if item is _COLLECT_DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if unwrap is None:
+                    if isinstance(item, dict):
+                        unwrap = _identity
+                    elif hasattr(item, "as_dict"):
+                        unwrap = _as_dict
+                    else:
+                        logger.warning(
+                            "Unexpected %s item type: %s", label, type(item))
+                        continue
+                if unwrap is _as_dict:
+                    pending.append(item)
+                    if len(pending) >= self._COLLECT_OFFLOAD_BATCH:
+                        out.extend(await asyncio.to_thread(
+                            _as_dict_batch, pending))
+                        pending = []
+                else:
+                    append(unwrap(item))
+            if pending:
+                # Short tail: unwrap inline rather than paying a thread hop
+                out.extend(_as_dict_batch(pending))
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+        return out
 
-    async def get_trending_videos(self, count: int = 30, custom_ms_token: Optional[str] = None) -> List[Dict[str, Any]]:
+    @_with_api("fetch trending videos")
+    async def get_trending_videos(self, api: TikTokApi, count: int = 30) -> List[Dict[str, Any]]:
         """Get trending videos from TikTok."""
-        try:
-            async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
-                videos = []
-                async for video in api.trending.videos(count=count):
-                    videos.append(video.as_dict)
-                return videos
-        except Exception as e:
-            logger.error(f"Error fetching trending videos: {e}")
-            raise TikTokException(f"Failed to fetch trending videos: {e}")
+        return await self._collect(
+            api.trending.videos(count=count), "trending")
 
-    async def get_user_info(self, username: str, custom_ms_token: Optional[str] = None) -> Dict[str, Any]:
+    @_with_api("fetch user info for {0}")
+    async def get_user_info(self, api: TikTokApi, username: str) -> Dict[str, Any]:
         """Get user information by username."""
-        try:
-            async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
-                user = api.user(username)
-                user_info = await user.info()
-                return user_info.as_dict
-        except Exception as e:
-            logger.error(f"Error fetching user info for {username}: {e}")
-            raise TikTokException(
-                f"Failed to fetch user info for {username}: {e}")
+        user = api.user(username)
+        user_info = await user.info()
+        return user_info.as_dict
 
-    async def get_user_videos(self, username: str, count: int = 30, custom_ms_token: Optional[str] = None) -> List[Dict[str, Any]]:
+    @_with_api("fetch user videos for {0}")
+    async def get_user_videos(self, api: TikTokApi, username: str, count: int = 30) -> List[Dict[str, Any]]:
         """Get user's videos by username."""
-        try:
-            async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
-                videos: List[Dict[str, Any]] = []
-                async for video in api.user(username).videos(count=count):
-                    if isinstance(video, dict):
-                        videos.append(video)
-                    elif hasattr(video, "as_dict"):
-                        videos.append(video.as_dict)
-                    else:
-                        logger.warning(
-                            "Unexpected video item type: %s", type(video))
-                return videos
-        except Exception as e:
-            logger.error(f"Error fetching user videos for {username}: {e}")
-            raise TikTokException(
-                f"Failed to fetch user videos for {username}: {e}")
-
-    async def get_video_info(self, video_id: str, video_url: str = None, custom_ms_token: Optional[str] = None) -> Dict[str, Any]:
-        """Get video information by video ID."""
-        try:
-            async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
-                # Create video object with ID
-                video = api.video(id=video_id)
-
-                # If URL is provided, set it on the video object
-                if video_url:
-                    video.url = video_url
+        return await self._collect(
+            api.user(username).videos(count=count), "user_videos")
+
+    async def _fetch_one_video_info(self, api: TikTokApi, video_id: str, video_url: str = None) -> Dict[str, Any]:
+        """Fetch info for a single video on an already-checked-out API instance."""
+        # Create video object with ID
+        video = api.video(id=video_id)
+
+        # If URL is provided, set it on the video object
+        if video_url:
+            video.url = video_url
+            video_info = await video.info()
+        else:
+            # If no URL provided, try to construct a generic URL or use a different approach
+            # Some TikTok-Api versions might work without URL, others might need it
+            try:
+                # First try without URL
+                video_info = await video.info()
+            except Exception as url_error:
+                msg = str(url_error)
+                # Lowercase "url" is the common spelling; only pay the
+                # full .lower() pass on large messages when it is absent
+                if _URL_ERROR_MARKER in msg or _URL_ERROR_MARKER in msg.lower():
+                    # If URL is required, construct a generic URL
+                    generic_url = _GENERIC_VIDEO_URL.format(video_id)
+                    video.url = generic_url
+                    logger.info(
+                        "Using generic URL for video %s: %s",
+                        video_id, generic_url)
                     video_info = await video.info()
                 else:
-                    # If no URL provided, try to construct a generic URL or use a different approach
-                    # Some TikTok-Api versions might work without URL, others might need it
-                    try:
-                        # First try without URL
-                        video_info = await video.info()
-                    except Exception as url_error:
-                        if "url" in str(url_error).lower():
-                            # If URL is required, construct a generic URL
-                            generic_url = f"https://www.tiktok.com/@user/video/{video_id}"
-                            video.url = generic_url
-                            logger.info(
-                                f"Using generic URL for video {video_id}: {generic_url}")
-                            video_info = await video.info()
-                        else:
-                            raise url_error
-
-                if isinstance(video_info, dict):
-                    return video_info
-                if hasattr(video_info, "as_dict"):
-                    return video_info.as_dict
-                logger.warning("Unexpected video_info type: %s",
-                               type(video_info))
-                # Best effort fallback
-                return dict(video_info)  # may still fail if non-mapping
-        except Exception as e:
-            logger.error(f"Error fetching video info for {video_id}: {e}")
-            raise TikTokException(
-                f"Failed to fetch video info for {video_id}: {e}")
-
-    async def get_hashtag_videos(self, hashtag: str, count: int = 30, custom_ms_token: Optional[str] = None) -> List[Dict[str, Any]]:
+                    raise url_error
+
+        if isinstance(video_info, dict):
+            return video_info
+        if hasattr(video_info, "as_dict"):
+            return video_info.as_dict
+        logger.warning("Unexpected video_info type: %s", type(video_info))
+        # Best effort fallback
+        return dict(video_info)  # may still fail if non-mapping
+
+    @_with_api("fetch video info for {0}")
+    async def get_video_info(self, api: TikTokApi, video_id: str, video_url: str = None) -> Dict[str, Any]:
+        """Get video information by video ID."""
+        return await self._fetch_one_video_info(
+            api, video_id, video_url=video_url)
+
+    @_with_api("fetch batch video info")
+    async def get_many_video_info(self, api: TikTokApi, video_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get info for multiple videos over a single API checkout.
+
+        All lookups share one pooled session and run concurrently, so a
+        batch of N costs one pool rental instead of N. Failed lookups are
+        returned as the exception instance in that position rather than
+        failing the whole batch.
+        """
+        semaphore = asyncio.Semaphore(self._num_sessions)
+
+        async def fetch_one(video_id: str):
+            async with semaphore:
+                return await self._fetch_one_video_info(api, video_id)
+
+        return await asyncio.gather(
+            *[fetch_one(video_id) for video_id in video_ids],
+            return_exceptions=True)
+
+    @_with_api("fetch hashtag videos for #{0}")
+    async def get_hashtag_videos(self, api: TikTokApi, hashtag: str, count: int = 30) -> List[Dict[str, Any]]:
         """Get videos for a specific hashtag."""
-        try:
-            async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
-                videos = []
-                async for video in api.hashtag(name=hashtag).videos(count=count):
-                    videos.append(video.as_dict)
-                return videos
-        except Exception as e:
-            logger.error(f"Error fetching hashtag videos for #{hashtag}: {e}")
-            raise TikTokException(
-                f"Failed to fetch hashtag videos for #{hashtag}: {e}")
+        return await self._collect(
+            api.hashtag(name=hashtag).videos(count=count),
+            "hashtag_videos")
 
-    async def search_users(self, query: str, count: int = 30, custom_ms_token: Optional[str] = None) -> List[Dict[str, Any]]:
+    @_with_api("search users for query '{0}'")
+    async def search_users(self, api: TikTokApi, query: str, count: int = 30) -> List[Dict[str, Any]]:
         """Search for users by query."""
-        try:
-            async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
-                users = []
-                async for user in api.search.users(query, count=count):
-                    users.append(user.as_dict)
-                return users
-        except Exception as e:
-            logger.error(f"Error searching users for query '{query}': {e}")
-            raise TikTokException(
-                f"Failed to search users for query '{query}': {e}")
+        return await self._collect(
+            api.search.users(query, count=count), "search_users")
 
-    async def search_videos(self, query: str, count: int = 30, custom_ms_token: Optional[str] = None) -> List[Dict[str, Any]]:
+    @_with_api("search videos for query '{0}'")
+    async def search_videos(self, api: TikTokApi, query: str, count: int = 30) -> List[Dict[str, Any]]:
         """Search for videos by query."""
-        try:
-            async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
-                videos = []
-                async for video in api.search.videos(query, count=count):
-                    videos.append(video.as_dict)
-                return videos
-        except Exception as e:
-            logger.error(f"Error searching videos for query '{query}': {e}")
-            raise TikTokException(
-                f"Failed to search videos for query '{query}': {e}")
+        return await self._collect(
+            api.search.videos(query, count=count), "search_videos")
 
-    async def get_sound_videos(self, sound_id: str, count: int = 30, custom_ms_token: Optional[str] = None) -> List[Dict[str, Any]]:
+    @_with_api("fetch sound videos for sound {0}")
+    async def get_sound_videos(self, api: TikTokApi, sound_id: str, count: int = 30) -> List[Dict[str, Any]]:
         """Get videos using a specific sound."""
-        try:
-            async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
-                videos = []
-                async for video in api.sound(id=sound_id).videos(count=count):
-                    videos.append(video.as_dict)
-                return videos
-        except Exception as e:
-            logger.error(
-                f"Error fetching sound videos for sound {sound_id}: {e}")
-            raise TikTokException(
-                f"Failed to fetch sound videos for sound {sound_id}: {e}")
+        return await self._collect(
+            api.sound(id=sound_id).videos(count=count),
+            "sound_videos")
 
-    async def get_sound_info(self, sound_id: str, custom_ms_token: Optional[str] = None) -> Dict[str, Any]:
+    @_with_api("fetch sound info for {0}")
+    async def get_sound_info(self, api: TikTokApi, sound_id: str) -> Dict[str, Any]:
         """Get sound information by sound ID."""
-        try:
-            async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
-                sound = api.sound(id=sound_id)
-                sound_info = await sound.info()
-                return sound_info.as_dict
-        except Exception as e:
-            logger.error(f"Error fetching sound info for {sound_id}: {e}")
-            raise TikTokException(
-                f"Failed to fetch sound info for {sound_id}: {e}")
+        sound = api.sound(id=sound_id)
+        sound_info = await sound.info()
+        return sound_info.as_dict
 
-    async def get_hashtag_info(self, hashtag: str, custom_ms_token: Optional[str] = None) -> Dict[str, Any]:
+    @_with_api("fetch hashtag info for #{0}")
+    async def get_hashtag_info(self, api: TikTokApi, hashtag: str) -> Dict[str, Any]:
         """Get hashtag information by hashtag name."""
-        try:
-            async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
-                hashtag_obj = api.hashtag(name=hashtag)
-                hashtag_info = await hashtag_obj.info()
-                return hashtag_info.as_dict
-        except Exception as e:
-            logger.error(f"Error fetching hashtag info for #{hashtag}: {e}")
-            raise TikTokException(
-                f"Failed to fetch hashtag info for #{hashtag}: {e}")
+        hashtag_obj = api.hashtag(name=hashtag)
+        hashtag_info = await hashtag_obj.info()
+        return hashtag_info.as_dict
 
-    async def get_user_followers(self, username: str, count: int = 30, custom_ms_token: Optional[str] = None) -> List[Dict[str, Any]]:
+    @_with_api("fetch followers for {0}")
+    async def get_user_followers(self, api: TikTokApi, username: str, count: int = 30) -> List[Dict[str, Any]]:
         """Get user's followers."""
-        try:
-            async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
-                followers = []
-                async for follower in api.user(username).followers(count=count):
-                    followers.append(follower.as_dict)
-                return followers
-        except Exception as e:
-            logger.error(f"Error fetching followers for {username}: {e}")
-            raise TikTokException(
-                f"Failed to fetch followers for {username}: {e}")
+        return await self._collect(
+            api.user(username).followers(count=count), "followers")
 
-    async def get_user_following(self, username: str, count: int = 30, custom_ms_token: Optional[str] = None) -> List[Dict[str, Any]]:
+    @_with_api("fetch following for {0}")
+    async def get_user_following(self, api: TikTokApi, username: str, count: int = 30) -> List[Dict[str, Any]]:
         """Get users that the user is following."""
-        try:
-            async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
-                following = []
-                async for user in api.user(username).following(count=count):
-                    following.append(user.as_dict)
-                return following
-        except Exception as e:
-            logger.error(f"Error fetching following for {username}: {e}")
-            raise TikTokException(
-                f"Failed to fetch following for {username}: {e}")
+        return await self._collect(
+            api.user(username).following(count=count), "following")
 
-    async def get_video_comments(self, video_id: str, count: int = 30, custom_ms_token: Optional[str] = None) -> List[Dict[str, Any]]:
+    @_with_api("fetch comments for video {0}")
+    async def get_video_comments(self, api: TikTokApi, video_id: str, count: int = 30) -> List[Dict[str, Any]]:
         """Get comments for a video."""
+        return await self._collect(
+            api.video(id=video_id).comments(count=count), "comments")
+
+    VIDEO_INFO_TTL = 600.0  # seconds cached video metadata stays fresh
+    VIDEO_INFO_NEGATIVE_TTL = 30.0  # seconds cached failures stay fresh
+    VIDEO_INFO_CACHE_MAX = 1024
+
+    @staticmethod
+    def _video_info_payload(entry: tuple) -> Dict[str, Any]:
+        """Unwrap a cache entry, re-raising negative-cached failures."""
+        payload = entry[1]
+        if isinstance(payload, TikTokException):
+            raise payload
+        return payload
+
+    async def _get_video_info_cached(self, video_id: str, video_url: Optional[str], custom_ms_token: Optional[str]) -> Dict[str, Any]:
+        """Fetch video metadata through the TTL cache with single-flight.
+
+        Retries and polling clients re-request the same video within
+        minutes; a cache hit skips the whole Playwright session checkout.
+        Concurrent misses for one key share a single upstream fetch, and
+        failures are negative-cached briefly so a bad ID does not burn a
+        session checkout per retry. Entries store their expiry deadline.
+        """
+        key = (video_id, video_url)
+        cache = self._video_info_cache
+        entry = cache.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            cache.move_to_end(key)
+            return self._video_info_payload(entry)
+
+        lock = self._video_info_locks.setdefault(key, asyncio.Lock())
         try:
-            async with self.get_api_instance(custom_ms_token=custom_ms_token) as api:
-                comments = []
-                video = api.video(id=video_id)
-                async for comment in video.comments(count=count):
-                    comments.append(comment.as_dict)
-                return comments
-        except Exception as e:
-            logger.error(f"Error fetching comments for video {video_id}: {e}")
-            raise TikTokException(
-                f"Failed to fetch comments for video {video_id}: {e}")
+            async with lock:
+                # Re-check: another coroutine may have populated while we
+                # waited
+                entry = cache.get(key)
+                if entry is not None and time.monotonic() < entry[0]:
+                    return self._video_info_payload(entry)
+                try:
+                    video_data = await self.get_video_info(
+                        video_id, video_url=video_url,
+                        custom_ms_token=custom_ms_token)
+                    cache[key] = (
+                        time.monotonic() + self.VIDEO_INFO_TTL, video_data)
+                except TikTokException as e:
+                    cache[key] = (
+                        time.monotonic() + self.VIDEO_INFO_NEGATIVE_TTL, e)
+                    raise
+                finally:
+                    # Cancellation can exit before the key is stored
+                    if key in cache:
+                        cache.move_to_end(key)
+                    while len(cache) > self.VIDEO_INFO_CACHE_MAX:
+                        cache.popitem(last=False)
+        finally:
+            # The pop must run even when the lookup raises, or failing
+            # keys accumulate lock entries without bound (the cache is
+            # LRU-capped; this dict is not)
+            self._video_info_locks.pop(key, None)
+        return video_data
 
     async def get_video_download_info(self, video_id: str, video_url: str = None, watermark: bool = False, quality: str = "auto", custom_ms_token: Optional[str] = None) -> Dict[str, Any]:
         """Get video download information including URLs for different qualities and watermark options."""
-        start_time = time.time()
+        start_time = time.perf_counter()
         logger.info(
-            f"Starting video download info request - Video ID: {video_id}, URL: {video_url}, Watermark: {watermark}, Quality: {quality}")
+            "Starting video download info request - Video ID: %s, URL: %s, Watermark: %s, Quality: %s",
+            video_id, video_url, watermark, quality)
 
         try:
             # Reuse the existing get_video_info method to avoid duplicating logic
-            logger.debug(f"Fetching video info for {video_id}")
-            video_data = await self.get_video_info(video_id, video_url=video_url, custom_ms_token=custom_ms_token)
-            logger.info(f"Successfully retrieved video data for {video_id}")
+            logger.debug("Fetching video info for %s", video_id)
+            video_data = await self._get_video_info_cached(
+                video_id, video_url, custom_ms_token)
+            logger.info("Successfully retrieved video data for %s", video_id)
 
             # Extract download URLs from video data
             logger.debug(
-                f"Extracting download URLs for {video_id} with watermark={watermark}, quality={quality}")
+                "Extracting download URLs for %s with watermark=%s, quality=%s",
+                video_id, watermark, quality)
             download_urls = self._extract_download_urls(
                 video_data, watermark, quality)
             logger.info(
-                f"Extracted download URLs for {video_id}: {len([url for url in download_urls.values() if url])} URLs found")
+                "Extracted download URLs for %s: %d URLs found", video_id,
+                sum(1 for url in download_urls.values() if url))
 
             # Estimate file size and get duration
             file_size = self._estimate_file_size(video_data)
             duration = video_data.get("video", {}).get("duration", 0)
             logger.info(
-                f"Video metadata for {video_id}: File size: {file_size} bytes, Duration: {duration} seconds")
+                "Video metadata for %s: File size: %s bytes, Duration: %s seconds",
+                video_id, file_size, duration)
 
             result = {
                 "video_id": video_id,
@@ -404,83 +694,208 @@ class TikTokService:
                 "video_data": video_data
             }
 
-            elapsed_time = time.time() - start_time
-            logger.info(
-                f"Successfully prepared download info for {video_id} in {elapsed_time:.2f} seconds")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Successfully prepared download info for %s in %.2f seconds",
+                    video_id, time.perf_counter() - start_time)
             return result
 
         except Exception as e:
-            elapsed_time = time.time() - start_time
+            elapsed_time = time.perf_counter() - start_time
             logger.error(
                 f"Error fetching video download info for {video_id} after {elapsed_time:.2f} seconds: {e}", exc_info=True)
             raise TikTokException(
-                f"Failed to fetch video download info for {video_id}: {e}")
+                f"Failed to fetch video download info for {video_id}") from e
 
-    async def get_video_bytes(self, video_id: str, video_url: str = None, watermark: bool = False, quality: str = "auto", custom_ms_token: Optional[str] = None) -> bytes:
-        """Get video bytes for streaming download."""
-        start_time = time.time()
-        logger.info(
-            f"Starting video bytes download - Video ID: {video_id}, URL: {video_url}, Watermark: {watermark}, Quality: {quality}")
+    async def _resolve_download_url(self, video_id: str, video_url: str = None, watermark: bool = False, quality: str = "auto", custom_ms_token: Optional[str] = None) -> str:
+        """Resolve the CDN download URL for a video, raising if none fits."""
+        logger.debug("Getting download info for %s", video_id)
+        download_info = await self.get_video_download_info(video_id, video_url, watermark, quality, custom_ms_token)
+        logger.info("Retrieved download info for %s", video_id)
 
+        # Select the appropriate download URL based on preferences
+        download_urls = download_info["download_urls"]
+        logger.debug(
+            "Selecting download URL for %s with watermark=%s, quality=%s",
+            video_id, watermark, quality)
+        selected_url = self._select_download_url(
+            download_urls, watermark, quality)
+        if selected_url:
+            logger.info(
+                "Selected download URL for %s: %.100s...",
+                video_id, selected_url)
+        else:
+            logger.info("No URL selected")
+
+        if not selected_url:
+            logger.error(
+                f"No suitable download URL found for {video_id} with preferences: watermark={watermark}, quality={quality}")
+            raise TikTokException(
+                "No suitable download URL found for the specified preferences")
+        return selected_url
+
+    STREAM_CHUNK_SIZE = 65536
+    DOWNLOAD_RETRIES = 3
+
+    async def _stream_from_url(self, url: str, label: str) -> AsyncGenerator[bytes, None]:
+        """Stream bytes from a resolved CDN URL over the pooled client.
+
+        Transient CDN hiccups (5xx, connection resets) are retried with
+        jittered exponential backoff. The URL is already resolved, so a
+        retry costs ~100ms instead of the full Playwright metadata
+        round-trip. Once bytes have been yielded the response is partially
+        consumed and retrying would corrupt the stream, so failures then
+        propagate.
+        """
+        client = await self._get_http()
+        total = 0
+        for attempt in range(self.DOWNLOAD_RETRIES):
+            try:
+                async with client.stream("GET", url) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes(self.STREAM_CHUNK_SIZE):
+                        total += len(chunk)
+                        yield chunk
+                return
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retriable = (
+                    isinstance(e, httpx.TransportError)
+                    or e.response.status_code >= 500)
+                if (total or not retriable
+                        or attempt == self.DOWNLOAD_RETRIES - 1):
+                    raise
+                delay = 0.1 * (2 ** attempt) + random.random() * 0.05
+                logger.warning(
+                    "Retrying download for %s after %s (attempt %d)",
+                    label, e, attempt + 1)
+                await asyncio.sleep(delay)
+
+    async def get_video_bytes_from_url(self, url: str) -> bytes:
+        """Download video bytes from an already-resolved CDN URL.
+
+        Fast path for callers that cached the download URL from a previous
+        resolution: skips session checkout and the Playwright metadata
+        round-trip entirely and goes straight to the pooled HTTP client.
+        """
         try:
-            # First get the download info to get the appropriate URL
-            logger.debug(f"Getting download info for {video_id}")
-            download_info = await self.get_video_download_info(video_id, video_url, watermark, quality, custom_ms_token)
-            logger.info(f"Retrieved download info for {video_id}")
+            return b"".join([
+                chunk async for chunk in self._stream_from_url(url, url[:100])
+            ])
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error downloading from resolved URL: {e}")
+            raise TikTokException(
+                "Failed to download video from URL") from e
 
-            # Select the appropriate download URL based on preferences
-            download_urls = download_info["download_urls"]
-            logger.debug(
-                f"Selecting download URL for {video_id} with watermark={watermark}, quality={quality}")
-            selected_url = self._select_download_url(
-                download_urls, watermark, quality)
-            logger.info(
-                f"Selected download URL for {video_id}: {selected_url[:100]}..." if selected_url else "No URL selected")
-
-            if not selected_url:
-                logger.error(
-                    f"No suitable download URL found for {video_id} with preferences: watermark={watermark}, quality={quality}")
-                raise TikTokException(
-                    "No suitable download URL found for the specified preferences")
-
-            # Download the video bytes
-            logger.info(f"Starting video download for {video_id} from URL")
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(selected_url)
-                response.raise_for_status()
-                video_bytes = response.content
-                elapsed_time = time.time() - start_time
+    async def stream_video_bytes(self, video_id: str, video_url: str = None, watermark: bool = False, quality: str = "auto", custom_ms_token: Optional[str] = None) -> AsyncGenerator[bytes, None]:
+        """Stream video bytes in chunks without buffering the whole file.
+
+        Peak memory stays at O(chunk size) per download instead of the full
+        MP4, and the first byte reaches the caller after ~1 RTT.
+        """
+        start_time = time.perf_counter()
+        logger.info(
+            "Starting video stream - Video ID: %s, URL: %s, Watermark: %s, Quality: %s",
+            video_id, video_url, watermark, quality)
+
+        try:
+            selected_url = await self._resolve_download_url(
+                video_id, video_url, watermark, quality, custom_ms_token)
+
+            total = 0
+            async for chunk in self._stream_from_url(selected_url, video_id):
+                total += len(chunk)
+                yield chunk
+            if logger.isEnabledFor(logging.INFO):
                 logger.info(
-                    f"Successfully downloaded video {video_id}: {len(video_bytes)} bytes in {elapsed_time:.2f} seconds")
-                return video_bytes
+                    "Successfully streamed video %s: %d bytes in %.2f seconds",
+                    video_id, total, time.perf_counter() - start_time)
 
         except httpx.HTTPError as e:
-            elapsed_time = time.time() - start_time
+            elapsed_time = time.perf_counter() - start_time
             logger.error(
                 f"HTTP error downloading video {video_id} after {elapsed_time:.2f} seconds: {e}", exc_info=True)
-            raise TikTokException(f"Failed to download video: {e}")
+            raise TikTokException(
+                "Failed to download video") from e
+        except TikTokException:
+            raise
         except Exception as e:
-            elapsed_time = time.time() - start_time
+            elapsed_time = time.perf_counter() - start_time
             logger.error(
                 f"Error downloading video bytes for {video_id} after {elapsed_time:.2f} seconds: {e}", exc_info=True)
             raise TikTokException(
-                f"Failed to download video bytes for {video_id}: {e}")
+                f"Failed to download video bytes for {video_id}") from e
+
+    async def get_video_bytes(self, video_id: str, video_url: str = None, watermark: bool = False, quality: str = "auto", custom_ms_token: Optional[str] = None) -> bytes:
+        """Get video bytes fully buffered (prefer stream_video_bytes)."""
+        return b"".join([
+            chunk async for chunk in self.stream_video_bytes(
+                video_id, video_url, watermark, quality, custom_ms_token)
+        ])
+
+    async def get_many_video_bytes(self, video_ids: List[str], watermark: bool = False, quality: str = "auto", concurrency: int = 8, custom_ms_token: Optional[str] = None) -> List[Any]:
+        """Download bytes for multiple videos concurrently.
+
+        The info + CDN fetch pipelines for each video overlap under a
+        bounded semaphore, so a batch of N costs roughly the slowest item
+        rather than the sum. Failed downloads come back as the exception
+        instance in that position.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_one(video_id: str):
+            async with semaphore:
+                return await self.get_video_bytes(
+                    video_id, watermark=watermark, quality=quality,
+                    custom_ms_token=custom_ms_token)
+
+        return await asyncio.gather(
+            *(fetch_one(video_id) for video_id in video_ids),
+            return_exceptions=True)
+
+    @staticmethod
+    def _classify_bitrates(bitrate_info) -> tuple:
+        """Classify bitrate variants into (hd_url, sd_url, auto_url)."""
+        hd_url = None
+        sd_url = None
+        auto_url = None
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for i, bitrate in enumerate(bitrate_info):
+            if not isinstance(bitrate, dict):
+                continue
+            quality_name = bitrate.get("GearName", "").lower()
+            urls = bitrate.get("PlayAddr", {}).get("UrlList")
+            if not urls:
+                continue
+            url = urls[0]
+            if debug:
+                logger.debug("Bitrate %d: %s -> %s", i, quality_name, url)
+            if not url:
+                continue
+            if any(token in quality_name for token in _HD_TOKENS):
+                hd_url = url
+            elif any(token in quality_name for token in _SD_TOKENS):
+                sd_url = url
+            else:
+                auto_url = url
+        return hd_url, sd_url, auto_url
 
     def _extract_download_urls(self, video_data: Dict[str, Any], watermark: bool, quality: str) -> Dict[str, Any]:
         """Extract download URLs from video data."""
         video_info = video_data.get("video", {})
+        debug = logger.isEnabledFor(logging.DEBUG)
 
-        # Log the video data structure for debugging
-        logger.debug(f"Video data structure: {list(video_data.keys())}")
-        logger.debug(f"Video info structure: {list(video_info.keys())}")
+        if debug:
+            # Log the video data structure for debugging
+            logger.debug("Video data structure: %s", list(video_data.keys()))
+            logger.debug("Video info structure: %s", list(video_info.keys()))
 
         # Extract URLs from different possible fields in TikTok API response
         play_addr = video_info.get("playAddr", "")
         download_addr = video_info.get("downloadAddr", "")
 
-        # Log the extracted URLs
-        logger.debug(f"PlayAddr: {play_addr}")
-        logger.debug(f"DownloadAddr: {download_addr}")
+        if debug:
+            logger.debug("PlayAddr: %s", play_addr)
+            logger.debug("DownloadAddr: %s", download_addr)
 
         # Try to get URLs from bitrate info (different qualities)
         bitrate_info = video_info.get("bitrateInfo", {})
@@ -489,33 +904,26 @@ class TikTokService:
         auto_url = None
 
         if bitrate_info:
-            logger.debug(f"Bitrate info found: {len(bitrate_info)} variants")
-            # Look for different quality variants
-            for i, bitrate in enumerate(bitrate_info):
-                if isinstance(bitrate, dict):
-                    quality_name = bitrate.get("GearName", "").lower()
-                    url = bitrate.get("PlayAddr", {}).get("UrlList", [None])[0]
-                    logger.debug(f"Bitrate {i}: {quality_name} -> {url}")
-                    if url:
-                        if "hd" in quality_name or "high" in quality_name:
-                            hd_url = url
-                        elif "sd" in quality_name or "standard" in quality_name:
-                            sd_url = url
-                        else:
-                            auto_url = url
+            if debug:
+                logger.debug(
+                    "Bitrate info found: %d variants", len(bitrate_info))
+            hd_url, sd_url, auto_url = self._classify_bitrates(bitrate_info)
 
         # Fallback to main URLs if no bitrate info
         if not any([hd_url, sd_url, auto_url]):
             auto_url = play_addr or download_addr
-            logger.debug(f"Using fallback auto_url: {auto_url}")
+            if debug:
+                logger.debug("Using fallback auto_url: %s", auto_url)
 
         # Determine watermark URLs
         # Note: This is a simplified approach - actual TikTok API may have different URLs
         with_watermark = play_addr or auto_url
         without_watermark = download_addr or auto_url
 
-        logger.debug(
-            f"Final URLs - with_watermark: {with_watermark}, without_watermark: {without_watermark}")
+        if debug:
+            logger.debug(
+                "Final URLs - with_watermark: %s, without_watermark: %s",
+                with_watermark, without_watermark)
 
         return {
             "with_watermark": with_watermark,
@@ -527,59 +935,80 @@ class TikTokService:
 
     def _select_download_url(self, download_urls: Dict[str, Any], watermark: bool, quality: str) -> Optional[str]:
         """Select the appropriate download URL based on preferences."""
-        logger.debug(
-            f"Selecting download URL with watermark={watermark}, quality={quality}")
-        logger.debug(f"Available URLs: {list(download_urls.keys())}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(
+                "Selecting download URL with watermark=%s, quality=%s",
+                watermark, quality)
+            logger.debug("Available URLs: %s", list(download_urls.keys()))
 
         # First select based on watermark preference
         if watermark:
             base_url = download_urls.get("with_watermark")
-            logger.debug(
-                f"Selected base URL (with watermark): {base_url[:100] if base_url else 'None'}...")
+            if debug:
+                logger.debug(
+                    "Selected base URL (with watermark): %.100s...", base_url)
         else:
             base_url = download_urls.get("without_watermark")
-            logger.debug(
-                f"Selected base URL (without watermark): {base_url[:100] if base_url else 'None'}...")
+            if debug:
+                logger.debug(
+                    "Selected base URL (without watermark): %.100s...",
+                    base_url)
 
         # Then select quality if available
         if quality == "hd" and download_urls.get("hd_url"):
             selected_url = download_urls["hd_url"]
-            logger.debug(f"Selected HD URL: {selected_url[:100]}...")
+            if debug:
+                logger.debug("Selected HD URL: %.100s...", selected_url)
             return selected_url
         elif quality == "sd" and download_urls.get("sd_url"):
             selected_url = download_urls["sd_url"]
-            logger.debug(f"Selected SD URL: {selected_url[:100]}...")
+            if debug:
+                logger.debug("Selected SD URL: %.100s...", selected_url)
             return selected_url
         elif quality == "auto" and download_urls.get("auto_url"):
             selected_url = download_urls["auto_url"]
-            logger.debug(f"Selected auto URL: {selected_url[:100]}...")
+            if debug:
+                logger.debug("Selected auto URL: %.100s...", selected_url)
             return selected_url
 
         # Fallback to base URL
-        logger.debug(
-            f"Using fallback base URL: {base_url[:100] if base_url else 'None'}...")
+        if debug:
+            logger.debug("Using fallback base URL: %.100s...", base_url)
         return base_url
 
+    # Rough SD bytes-per-second estimate: 1MB per 10 seconds of video
+    _BYTES_PER_SECOND_ESTIMATE = 104857
+
     def _estimate_file_size(self, video_data: Dict[str, Any]) -> Optional[int]:
         """Estimate file size from video data."""
-        video_info = video_data.get("video", {})
+        video_info = video_data.get("video") or {}
         # Try to get file size from video metadata
         file_size = video_info.get("fileSize")
         if file_size:
             return int(file_size)
 
-        # Estimate based on duration and quality (rough approximation)
-        duration = video_info.get("duration", 0)
+        # Estimate based on duration (rough approximation)
+        duration = video_info.get("duration") or 0
         if duration > 0:
-            # Rough estimate: 1MB per 10 seconds for SD, 2MB per 10 seconds for HD
-            estimated_size = (duration / 10) * 1024 * \
-                1024  # 1MB per 10 seconds
-            return int(estimated_size)
-
+            return int(duration) * self._BYTES_PER_SECOND_ESTIMATE
         return None
 
+    HEALTH_CHECK_TTL = 30.0  # seconds a successful call counts as proof of health
+
     async def health_check(self, custom_ms_token: Optional[str] = None) -> Dict[str, Any]:
-        """Perform a health check on the TikTok service."""
+        """Perform a health check on the TikTok service.
+
+        A recent successful API call short-circuits the probe so frequent
+        load-balancer polls don't each trigger a full trending fetch.
+        """
+        if time.monotonic() - self._last_ok_at < self.HEALTH_CHECK_TTL:
+            return {
+                "status": "healthy",
+                "message": "TikTok service is operational (recent successful call)",
+                "test_videos_fetched": 0
+            }
+
         try:
             # Try to get a small number of trending videos as a health check
             videos = await self.get_trending_videos(count=1, custom_ms_token=custom_ms_token)
@@ -596,10 +1025,18 @@ class TikTokService:
             }
 
 
-# Global TikTok service instance
-tiktok_service = TikTokService()
+# Global TikTok service instance, created lazily so importing this module
+# stays side-effect free (no settings load or proxy-provider construction
+# at import time)
+_tiktok_service: Optional[TikTokService] = None
+_tiktok_service_lock = threading.Lock()
 
 
 def get_tiktok_service() -> TikTokService:
-    """Get the global TikTok service instance."""
-    return tiktok_service
+    """Get the global TikTok service instance, creating it on first use."""
+    global _tiktok_service
+    if _tiktok_service is None:
+        with _tiktok_service_lock:
+            if _tiktok_service is None:
+                _tiktok_service = TikTokService()
+    return _tiktok_service
@@ -1,192 +1,349 @@
 """MS Token management service with rotation support."""
 
-import asyncio
+import heapq
+import itertools
 import logging
 import random
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+import sys
+import time
+from array import array
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime
 
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+_NS_PER_HOUR = 3_600_000_000_000
+
+# Health timestamps are monotonic (immune to NTP skew, cheaper to read);
+# this offset converts them back to wall-clock time only when stats are
+# serialized to ISO strings
+_WALL_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
 
 class TokenManager:
-    """Manages MS tokens with rotation and health tracking."""
+    """Manages MS tokens with rotation and health tracking.
+
+    Token health lives in parallel arrays indexed by token id
+    (structure-of-arrays layout): scans over failure counts and
+    timestamps walk contiguous ints instead of chasing pointers through
+    a dict of per-token dicts.
+    """
+
+    __slots__ = (
+        "settings", "tokens", "_rr_counter", "_token_index", "_is_healthy",
+        "_token_prefix", "_failure_count", "_consecutive_failures",
+        "_last_used_ns", "_last_failure_ns", "_healthy_tokens",
+        "_healthy_set", "_lru_heap", "_in_heap", "_lru_tiebreaker",
+        "_stats_cache", "_stats_dirty", "_strategy_map",
+    )
 
     def __init__(self):
-        self.settings = get_settings()
-        self.tokens: List[str] = self.settings.ms_tokens_list.copy()
-        self.token_health: Dict[str, Dict[str, Any]] = {}
-        self.current_index = 0
-        self._lock = asyncio.Lock()
-
-        # Initialize token health tracking
-        for token in self.tokens:
-            self.token_health[token] = {
-                "is_healthy": True,
-                "last_used": None,
-                "failure_count": 0,
-                "last_failure": None,
-                "consecutive_failures": 0
-            }
+        # Resolve settings once; every later read goes through the bound
+        # attribute instead of a fresh get_settings() call
+        settings = get_settings()
+        self.settings = settings
+        # Interned tokens: every dict/set lookup below starts with a
+        # pointer comparison instead of a character-by-character one.
+        # Both token views are immutable tuples replaced wholesale on
+        # mutation (copy-on-write): a reader that grabbed a reference
+        # always sees a consistent snapshot, with no lock.
+        self.tokens: Tuple[str, ...] = tuple(
+            sys.intern(token) for token in settings.ms_tokens_list)
+        # Atomic round-robin cursor: next() on itertools.count is a single
+        # C-level increment, so token selection needs no lock
+        self._rr_counter = itertools.count()
+
+        # Parallel health arrays, all indexed by _token_index[token]. The
+        # index map doubles as the O(1) membership check for
+        # add_token/remove_token, so the token list is never scanned.
+        n = len(self.tokens)
+        self._token_index: Dict[str, int] = {
+            token: i for i, token in enumerate(self.tokens)}
+        self._is_healthy: List[bool] = [True] * n
+        # Log-safe first-10-char prefixes, sliced once per token instead
+        # of on every health-transition log line
+        self._token_prefix: Dict[str, str] = {
+            token: token[:10] for token in self.tokens}
+        self._failure_count = array("i", [0] * n)
+        self._consecutive_failures = array("i", [0] * n)
+        self._last_used_ns = array("q", [0] * n)
+        self._last_failure_ns = array("q", [0] * n)
+
+        # Cached healthy-token view, updated only on health transitions so
+        # get_token avoids a full rescan per call. The tuple is replaced
+        # wholesale (atomic under the GIL), never mutated in place; the
+        # set gives O(1) membership checks.
+        self._healthy_tokens: Tuple[str, ...] = self.tokens
+        self._healthy_set: set = set(self.tokens)
+
+        # Min-heap of (last_used_ns, tiebreaker, token) for least_used
+        # selection: O(log N) pop/push instead of an O(N) min() scan.
+        # _in_heap keeps one live entry per healthy token; entries for
+        # tokens that turned unhealthy are dropped lazily on pop.
+        self._lru_heap: List[tuple] = [
+            (0, i, token) for i, token in enumerate(self.tokens)]
+        heapq.heapify(self._lru_heap)
+        self._in_heap: set = set(self.tokens)
+        self._lru_tiebreaker = itertools.count(len(self.tokens))
+
+        # Memoized get_token_stats payload; mutators flip the dirty flag
+        # so frequently polled monitoring endpoints reuse the built dict
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._stats_dirty = True
+
+        # Strategy dispatch bound once: one dict lookup per get_token
+        # instead of a chain of string comparisons
+        self._strategy_map = {
+            "round_robin": self._get_round_robin_token,
+            "random": self._get_random_token,
+            "least_used": self._get_least_used_token,
+        }
+
+    def _mark_healthy(self, token: str) -> None:
+        """Add a token to the cached healthy view if absent."""
+        if token not in self._healthy_set:
+            self._healthy_set.add(token)
+            self._healthy_tokens = self._healthy_tokens + (token,)
+        if token not in self._in_heap:
+            # Revived tokens enter at priority 0 so they are tried first
+            heapq.heappush(
+                self._lru_heap, (0, next(self._lru_tiebreaker), token))
+            self._in_heap.add(token)
+
+    def _mark_unhealthy(self, token: str) -> None:
+        """Drop a token from the cached healthy view if present."""
+        if token in self._healthy_set:
+            self._healthy_set.discard(token)
+            self._healthy_tokens = tuple(
+                t for t in self._healthy_tokens if t != token)
 
     def add_token(self, token: str) -> None:
         """Add a new token to the pool."""
-        if token not in self.tokens:
-            self.tokens.append(token)
-            self.token_health[token] = {
-                "is_healthy": True,
-                "last_used": None,
-                "failure_count": 0,
-                "last_failure": None,
-                "consecutive_failures": 0
-            }
+        token = sys.intern(token)
+        if token not in self._token_index:
+            self._token_index[token] = len(self.tokens)
+            self.tokens = self.tokens + (token,)
+            self._is_healthy.append(True)
+            self._failure_count.append(0)
+            self._consecutive_failures.append(0)
+            self._last_used_ns.append(0)
+            self._last_failure_ns.append(0)
+            self._token_prefix[token] = token[:10]
+            self._mark_healthy(token)
+            self._stats_dirty = True
             logger.info(
-                f"Added new token to pool. Total tokens: {len(self.tokens)}")
+                "Added new token to pool. Total tokens: %d", len(self.tokens))
 
     def remove_token(self, token: str) -> None:
         """Remove a token from the pool."""
-        if token in self.tokens:
-            self.tokens.remove(token)
-            if token in self.token_health:
-                del self.token_health[token]
+        if token in self._token_index:
+            self._rebuild_without({token})
+            self._mark_unhealthy(token)
+            self._stats_dirty = True
             logger.info(
-                f"Removed token from pool. Total tokens: {len(self.tokens)}")
-
-    def get_healthy_tokens(self) -> List[str]:
-        """Get list of healthy tokens."""
-        return [
-            token for token in self.tokens
-            if self.token_health.get(token, {}).get("is_healthy", False)
-        ]
+                "Removed token from pool. Total tokens: %d", len(self.tokens))
+
+    def _rebuild_without(self, dropped: set) -> None:
+        """Rebuild the token list and parallel arrays excluding `dropped`.
+
+        One O(N) pass regardless of how many tokens are removed.
+        """
+        keep = [i for i, token in enumerate(self.tokens)
+                if token not in dropped]
+        for token in dropped:
+            self._token_prefix.pop(token, None)
+        self.tokens = tuple(self.tokens[i] for i in keep)
+        self._token_index = {
+            token: i for i, token in enumerate(self.tokens)}
+        self._is_healthy = [self._is_healthy[i] for i in keep]
+        self._failure_count = array(
+            "i", (self._failure_count[i] for i in keep))
+        self._consecutive_failures = array(
+            "i", (self._consecutive_failures[i] for i in keep))
+        self._last_used_ns = array(
+            "q", (self._last_used_ns[i] for i in keep))
+        self._last_failure_ns = array(
+            "q", (self._last_failure_ns[i] for i in keep))
+
+    def get_healthy_tokens(self) -> Tuple[str, ...]:
+        """Get the cached tuple of healthy tokens (immutable snapshot)."""
+        return self._healthy_tokens
 
     async def get_token(self, strategy: str = "round_robin") -> Optional[str]:
-        """Get a token using the specified strategy."""
-        async with self._lock:
-            healthy_tokens = self.get_healthy_tokens()
-
-            if not healthy_tokens:
-                logger.warning("No healthy tokens available")
-                return None
-
-            if strategy == "round_robin":
-                token = self._get_round_robin_token(healthy_tokens)
-            elif strategy == "random":
-                token = self._get_random_token(healthy_tokens)
-            elif strategy == "least_used":
-                token = self._get_least_used_token(healthy_tokens)
-            else:
-                token = self._get_round_robin_token(healthy_tokens)
-
-            # Update last used timestamp
-            if token:
-                self.token_health[token]["last_used"] = datetime.utcnow()
-
-            return token
-
-    def _get_round_robin_token(self, healthy_tokens: List[str]) -> str:
-        """Get token using round-robin strategy."""
+        """Get a token using the specified strategy.
+
+        Selection is lock-free: every strategy runs synchronously with no
+        await inside, so the GIL already serializes the short critical
+        section (list read, counter increment, heap pop/push). An asyncio
+        lock here would only add task-scheduling overhead per fetch.
+        """
+        healthy_tokens = self.get_healthy_tokens()
+
         if not healthy_tokens:
+            logger.warning("No healthy tokens available")
             return None
 
-        token = healthy_tokens[self.current_index % len(healthy_tokens)]
-        self.current_index = (self.current_index + 1) % len(healthy_tokens)
+        select = self._strategy_map.get(
+            strategy, self._get_round_robin_token)
+        token = select(healthy_tokens)
+
+        # Update last used timestamp
+        if token:
+            self._last_used_ns[self._token_index[token]] = time.monotonic_ns()
+            self._stats_dirty = True
+
         return token
 
-    def _get_random_token(self, healthy_tokens: List[str]) -> str:
+    def _get_round_robin_token(self, healthy_tokens: Tuple[str, ...]) -> str:
+        """Get token using round-robin strategy."""
+        if not healthy_tokens:
+            return None
+
+        return healthy_tokens[next(self._rr_counter) % len(healthy_tokens)]
+
+    def _get_random_token(self, healthy_tokens: Tuple[str, ...]) -> str:
         """Get token using random strategy."""
         return random.choice(healthy_tokens) if healthy_tokens else None
 
-    def _get_least_used_token(self, healthy_tokens: List[str]) -> str:
-        """Get token that was used least recently."""
+    def _get_least_used_token(self, healthy_tokens: Tuple[str, ...]) -> str:
+        """Get token that was used least recently.
+
+        Pops the min-heap until a healthy entry surfaces (lazy deletion of
+        stale ones), then pushes the token back stamped with the current
+        monotonic time — O(log N) per selection.
+        """
         if not healthy_tokens:
             return None
 
-        least_used_token = min(
-            healthy_tokens,
-            key=lambda t: self.token_health[t]["last_used"] or datetime.min
-        )
-        return least_used_token
+        heap = self._lru_heap
+        while heap:
+            _, _, token = heapq.heappop(heap)
+            self._in_heap.discard(token)
+            if token in self._healthy_set:
+                heapq.heappush(heap, (
+                    time.monotonic_ns(), next(self._lru_tiebreaker), token))
+                self._in_heap.add(token)
+                return token
+
+        # All entries were stale; reseed from the healthy view and retry
+        for token in healthy_tokens:
+            self._mark_healthy(token)
+        return self._get_least_used_token(healthy_tokens)
 
     async def mark_token_success(self, token: str) -> None:
         """Mark a token as successful."""
-        if token in self.token_health:
-            self.token_health[token]["consecutive_failures"] = 0
-            self.token_health[token]["is_healthy"] = True
-            logger.debug(f"Token marked as successful: {token[:10]}...")
+        idx = self._token_index.get(token)
+        if idx is not None:
+            self._consecutive_failures[idx] = 0
+            self._is_healthy[idx] = True
+            self._mark_healthy(token)
+            self._stats_dirty = True
+            logger.debug(
+                "Token marked as successful: %s...", self._token_prefix[token])
 
     async def mark_token_failure(self, token: str, error: Optional[str] = None) -> None:
         """Mark a token as failed."""
-        if token not in self.token_health:
+        idx = self._token_index.get(token)
+        if idx is None:
             return
 
-        health_info = self.token_health[token]
-        health_info["failure_count"] += 1
-        health_info["consecutive_failures"] += 1
-        health_info["last_failure"] = datetime.utcnow()
+        self._failure_count[idx] += 1
+        self._consecutive_failures[idx] += 1
+        self._last_failure_ns[idx] = time.monotonic_ns()
+        self._stats_dirty = True
 
         # Mark as unhealthy if too many consecutive failures
         max_consecutive_failures = 3
-        if health_info["consecutive_failures"] >= max_consecutive_failures:
-            health_info["is_healthy"] = False
+        if self._consecutive_failures[idx] >= max_consecutive_failures:
+            self._is_healthy[idx] = False
+            self._mark_unhealthy(token)
             logger.warning(
-                f"Token marked as unhealthy due to {health_info['consecutive_failures']} "
-                f"consecutive failures: {token[:10]}..."
+                "Token marked as unhealthy due to %d consecutive failures: %s...",
+                self._consecutive_failures[idx], self._token_prefix[token]
             )
 
         logger.debug(
-            f"Token failure recorded: {token[:10]}... (Error: {error})")
+            "Token failure recorded: %s... (Error: %s)",
+            self._token_prefix[token], error)
 
     async def reset_token_health(self, token: str) -> None:
         """Reset a token's health status."""
-        if token in self.token_health:
-            self.token_health[token] = {
-                "is_healthy": True,
-                "last_used": None,
-                "failure_count": 0,
-                "last_failure": None,
-                "consecutive_failures": 0
-            }
-            logger.info(f"Token health reset: {token[:10]}...")
+        idx = self._token_index.get(token)
+        if idx is not None:
+            self._is_healthy[idx] = True
+            self._failure_count[idx] = 0
+            self._consecutive_failures[idx] = 0
+            self._last_used_ns[idx] = 0
+            self._last_failure_ns[idx] = 0
+            self._mark_healthy(token)
+            self._stats_dirty = True
+            logger.info("Token health reset: %s...", self._token_prefix[token])
 
     async def cleanup_unhealthy_tokens(self, max_age_hours: int = 24) -> None:
-        """Remove tokens that have been unhealthy for too long."""
-        cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
+        """Remove tokens that have been unhealthy for too long.
+
+        One scan over the parallel arrays picks the victims, then a
+        single rebuild drops them all — O(N) total instead of a
+        per-token remove_token (each itself O(N)).
+        """
+        cutoff_ns = time.monotonic_ns() - max_age_hours * _NS_PER_HOUR
+
+        dropped = {
+            token for i, token in enumerate(self.tokens)
+            if (not self._is_healthy[i]
+                and self._last_failure_ns[i]
+                and self._last_failure_ns[i] < cutoff_ns)
+        }
+        if not dropped:
+            return
 
-        tokens_to_remove = []
-        for token, health_info in self.token_health.items():
-            if (not health_info["is_healthy"] and
-                health_info["last_failure"] and
-                    health_info["last_failure"] < cutoff_time):
-                tokens_to_remove.append(token)
+        self._rebuild_without(dropped)
+        for token in dropped:
+            self._mark_unhealthy(token)
+            logger.info("Removed unhealthy token: %.10s...", token)
+        self._stats_dirty = True
 
-        for token in tokens_to_remove:
-            self.remove_token(token)
-            logger.info(f"Removed unhealthy token: {token[:10]}...")
+    @staticmethod
+    def _iso(ns: int) -> Optional[str]:
+        """Format a monotonic nanosecond timestamp as ISO 8601, or None."""
+        if not ns:
+            return None
+        return datetime.utcfromtimestamp(
+            (ns + _WALL_OFFSET_NS) / 1e9).isoformat()
 
     def get_token_stats(self) -> Dict[str, Any]:
-        """Get statistics about token usage."""
+        """Get statistics about token usage.
+
+        The payload is rebuilt only after a mutation; repeat polls return
+        the cached dict (treat it as read-only).
+        """
+        if not self._stats_dirty and self._stats_cache is not None:
+            return self._stats_cache
+
         total_tokens = len(self.tokens)
         healthy_tokens = len(self.get_healthy_tokens())
         unhealthy_tokens = total_tokens - healthy_tokens
 
-        return {
+        self._stats_cache = {
             "total_tokens": total_tokens,
             "healthy_tokens": healthy_tokens,
             "unhealthy_tokens": unhealthy_tokens,
             "health_percentage": (healthy_tokens / total_tokens * 100) if total_tokens > 0 else 0,
             "token_details": {
                 token: {
-                    "is_healthy": health_info["is_healthy"],
-                    "failure_count": health_info["failure_count"],
-                    "consecutive_failures": health_info["consecutive_failures"],
-                    "last_used": health_info["last_used"].isoformat() if health_info["last_used"] else None,
-                    "last_failure": health_info["last_failure"].isoformat() if health_info["last_failure"] else None
+                    "is_healthy": self._is_healthy[i],
+                    "failure_count": self._failure_count[i],
+                    "consecutive_failures": self._consecutive_failures[i],
+                    "last_used": self._iso(self._last_used_ns[i]),
+                    "last_failure": self._iso(self._last_failure_ns[i])
                 }
-                for token, health_info in self.token_health.items()
+                for i, token in enumerate(self.tokens)
             }
         }
+        self._stats_dirty = False
+        return self._stats_cache
 
 
 # Global token manager instance
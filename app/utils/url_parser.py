@@ -1,20 +1,73 @@
 """TikTok URL parsing utilities."""
 
+import asyncio
 import re
 import logging
-from typing import Optional
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
 import httpx
 
 logger = logging.getLogger(__name__)
 
-# Regex patterns for TikTok URLs
+# TTL + LRU cache of short URL -> (expiry, resolved URL, video ID).
+# Reshared shortlinks hit the same entries repeatedly, so cache hits skip
+# the network round-trip entirely; the video ID is extracted once at
+# resolution time so cached lookups skip the regex as well. Failed
+# resolutions are cached briefly so broken URLs don't get hammered.
+# Per-URL locks coalesce concurrent resolutions of the same shortlink
+# into one request (single-flight).
+_RESOLVE_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_RESOLVE_CACHE_MAX = 1024
+_RESOLVE_CACHE_TTL = 3600.0
+_RESOLVE_NEGATIVE_TTL = 60.0
+_RESOLVE_LOCKS: Dict[str, asyncio.Lock] = {}
+
+# Shared client for redirect resolution: keeps keep-alive connections to
+# the shortlink hosts warm instead of paying a TCP+TLS handshake per
+# resolution
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get the shared redirect-resolution client, creating it lazily."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        client_kwargs = {
+            "follow_redirects": True,
+            "timeout": 10.0,
+            "limits": httpx.Limits(
+                max_keepalive_connections=50, max_connections=200)
+        }
+        try:
+            _CLIENT = httpx.AsyncClient(http2=True, **client_kwargs)
+        except ImportError:
+            _CLIENT = httpx.AsyncClient(**client_kwargs)
+    return _CLIENT
+
+
+async def aclose_resolver_client() -> None:
+    """Close the shared resolution client (called at application shutdown)."""
+    global _CLIENT
+    if _CLIENT is not None and not _CLIENT.is_closed:
+        await _CLIENT.aclose()
+    _CLIENT = None
+
+# Regex patterns for TikTok URLs. All supported variants are fused into
+# one alternation with named groups, so classifying a URL costs a single
+# C-level regex call instead of trying each pattern from Python.
 STANDARD_URL_PATTERN = re.compile(
     r'(?:https?://)?(?:www\.)?tiktok\.com/@[\w.-]+/video/(\d+)'
 )
-SHORT_URL_PATTERNS = [
-    re.compile(r'(?:https?://)?vm\.tiktok\.com/([\w-]+)'),
-    re.compile(r'(?:https?://)?(?:www\.)?tiktok\.com/t/([\w-]+)'),
-]
+COMBINED_URL_PATTERN = re.compile(
+    r'(?:https?://)?'
+    r'(?:'
+    r'(?:www\.)?tiktok\.com/@[\w.-]+/video/(?P<id>\d+)'
+    r'|vm\.tiktok\.com/(?P<vm>[\w-]+)'
+    r'|(?:www\.)?tiktok\.com/t/(?P<t>[\w-]+)'
+    r')'
+)
 
 
 async def extract_video_id_from_url(url: str, resolve_redirects: bool = True) -> Optional[str]:
@@ -39,26 +92,26 @@ async def extract_video_id_from_url(url: str, resolve_redirects: bool = True) ->
         logger.error("Empty URL provided")
         return None
 
-    # Try to extract from standard URL format
-    match = STANDARD_URL_PATTERN.search(url)
-    if match:
-        return match.group(1)
-
-    # Check if it's a short URL
-    if resolve_redirects:
-        for pattern in SHORT_URL_PATTERNS:
-            if pattern.search(url):
-                resolved_url = await resolve_short_url(url)
-                if resolved_url:
-                    # Try to extract from resolved URL
-                    match = STANDARD_URL_PATTERN.search(resolved_url)
-                    if match:
-                        return match.group(1)
-
-    # If URL is already just a video ID
-    if url.isdigit():
+    # Fast path: a bare numeric video ID needs no regex at all. The
+    # first-char check keeps the full isdigit scan off the URL path.
+    if url[0].isdigit() and url.isdigit():
         return url
 
+    match = COMBINED_URL_PATTERN.search(url)
+    if match:
+        # Standard URL carries the ID directly. IDs are interned so the
+        # same video requested repeatedly shares one string object and
+        # downstream dict lookups compare by pointer.
+        video_id = match.group('id')
+        if video_id:
+            return sys.intern(video_id)
+
+        # Short URL (vm.tiktok.com or /t/): resolution extracts the ID
+        # in the same pass, so cache hits return it without re-matching
+        if resolve_redirects:
+            entry = await _resolve_entry(url)
+            return entry[2]
+
     return None
 
 
@@ -73,20 +126,64 @@ async def resolve_short_url(short_url: str, max_redirects: int = 5) -> Optional[
     Returns:
         Resolved full URL, or None if resolution fails
     """
-    try:
-        # Clean and validate URL
-        short_url = short_url.strip()
-        if not short_url:
-            logger.error("Empty short URL provided")
-            return None
+    # Clean and validate URL
+    short_url = short_url.strip()
+    if not short_url:
+        logger.error("Empty short URL provided")
+        return None
 
-        async with httpx.AsyncClient(follow_redirects=True, timeout=10.0) as client:
-            # Make a HEAD request to follow redirects without downloading content
-            response = await client.head(short_url, follow_redirects=True)
-            final_url = str(response.url)
+    entry = await _resolve_entry(short_url)
+    return entry[1]
 
-            logger.info(f"Resolved {short_url} to {final_url}")
-            return final_url
+
+async def _resolve_entry(short_url: str) -> tuple:
+    """Resolve a short URL to a cached (expiry, final URL, video ID) entry.
+
+    Resolution and ID extraction are fused: the standard-URL regex runs
+    once when the entry is built, and both resolve_short_url and
+    extract_video_id_from_url read their answer from the same tuple.
+    """
+    entry = _RESOLVE_CACHE.get(short_url)
+    if entry is not None and time.monotonic() < entry[0]:
+        _RESOLVE_CACHE.move_to_end(short_url)
+        return entry
+
+    lock = _RESOLVE_LOCKS.setdefault(short_url, asyncio.Lock())
+    async with lock:
+        # Re-check: another coroutine may have resolved while we waited
+        entry = _RESOLVE_CACHE.get(short_url)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry
+
+        final_url = await _resolve_short_url_uncached(short_url)
+        video_id = None
+        if final_url:
+            match = STANDARD_URL_PATTERN.search(final_url)
+            if match:
+                video_id = sys.intern(match.group(1))
+        ttl = _RESOLVE_CACHE_TTL if final_url else _RESOLVE_NEGATIVE_TTL
+        entry = (time.monotonic() + ttl, final_url, video_id)
+        _RESOLVE_CACHE[short_url] = entry
+        _RESOLVE_CACHE.move_to_end(short_url)
+        while len(_RESOLVE_CACHE) > _RESOLVE_CACHE_MAX:
+            _RESOLVE_CACHE.popitem(last=False)
+    _RESOLVE_LOCKS.pop(short_url, None)
+    return entry
+
+
+async def _resolve_short_url_uncached(short_url: str) -> Optional[str]:
+    """Resolve a short URL over the network (no caching)."""
+    try:
+        client = _get_client()
+        # Ranged GET instead of HEAD: some shortlink hosts answer HEAD
+        # with 405 or strip redirects, while bytes=0-0 follows the same
+        # redirect chain and transfers at most one body byte
+        response = await client.get(
+            short_url, headers={"Range": "bytes=0-0"}, follow_redirects=True)
+        final_url = str(response.url)
+
+        logger.info(f"Resolved {short_url} to {final_url}")
+        return final_url
 
     except httpx.HTTPError as e:
         logger.error(f"Error resolving short URL {short_url}: {e}")
@@ -106,14 +203,14 @@ def extract_video_id_sync(url: str) -> Optional[str]:
     Returns:
         Video ID as string, or None if extraction fails
     """
+    # Fast path: already a bare numeric video ID
+    if url and url[0].isdigit() and url.isdigit():
+        return url
+
     # Try standard URL format
     match = STANDARD_URL_PATTERN.search(url)
     if match:
-        return match.group(1)
-
-    # If URL is already just a video ID
-    if url.isdigit():
-        return url
+        return sys.intern(match.group(1))
 
     return None
 
@@ -128,16 +225,10 @@ def is_tiktok_url(url: str) -> bool:
     Returns:
         True if it's a TikTok URL, False otherwise
     """
-    # Check for standard URL
-    if STANDARD_URL_PATTERN.search(url):
-        return True
-
-    # Check for short URLs
-    for pattern in SHORT_URL_PATTERNS:
-        if pattern.search(url):
-            return True
-
-    return False
+    # Cheap substring scan rejects non-TikTok strings before the regex
+    if 'tiktok' not in url:
+        return False
+    return COMBINED_URL_PATTERN.search(url) is not None
 
 
 def normalize_video_identifier(identifier: str) -> str:
@@ -151,7 +242,7 @@ def normalize_video_identifier(identifier: str) -> str:
         Just the video ID (without URL resolution)
     """
     # If it's already a video ID
-    if identifier.isdigit():
+    if identifier and identifier[0].isdigit() and identifier.isdigit():
         return identifier
 
     # Try to extract from URL
@@ -1,5 +1,7 @@
 """Basic API tests."""
 
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, patch
@@ -144,6 +146,22 @@ def test_invalid_endpoint():
     assert response.status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_collect_propagates_midstream_error():
+    """A failing upstream iterator must raise, not hang the consumer."""
+    from app.services.tiktok_service import TikTokService
+
+    async def failing_iter():
+        yield {"id": "1"}
+        yield {"id": "2"}
+        raise RuntimeError("session died mid-stream")
+
+    service = TikTokService.__new__(TikTokService)
+    with pytest.raises(RuntimeError, match="mid-stream"):
+        await asyncio.wait_for(
+            service._collect(failing_iter(), "test"), timeout=5)
+
+
 def test_rate_limiting():
     """Test rate limiting functionality."""
     # This would require more complex setup with Redis